@@ -1,35 +1,36 @@
 from datetime import datetime
 from typing import Optional
 from string import capwords
-from dateutil.relativedelta import relativedelta
-from matplotlib import pyplot
-import csv, json, re, numpy
+import tax_cache, tenure, validation, writers
 
 class Employee:
+    FIELDS = ["ФИО", "Должность", "Дата найма", "Оклад", "Пол", "Размер премии"]
+    # Без __dict__ у каждого экземпляра: заметно меньше памяти на миллионах записей
+    __slots__ = ('__last_name', '__first_name', '__middle_name', '__position', '__hire_date', '__salary',
+                 '__sex', '__premium', '__taxes', '__programmer', '__listeners', '__weakref__')
+
     def __init__(self, last_name: str, first_name: str, position: str, hire_date: datetime,
-                 salary: int, sex: str, middle_name: Optional[str] = None):
+                 salary: int, sex: str, middle_name: Optional[str] = None, premium: int = 0):
         self.__last_name = last_name
         self.__first_name = first_name
         self.__middle_name = middle_name
         self.__position = position
+        self.__programmer = 'программист' in position
         self.__hire_date = hire_date
         self.__salary = salary
         self.__sex = sex
-        self.__premium = 0
+        self.__premium = premium
         self.__taxes = 0
+        self.__listeners = None
 
     @staticmethod
-    def write_to_json(employees, filename):
-        with open(filename, mode='w', encoding='utf-8') as file:
-            json.dump([employee.to_dict() for employee in employees], file, ensure_ascii=False, indent=4)
+    def write_to_json(employees, filename, mode: str = writers.PRETTY):
+        writers.write_json_array((employee.to_dict() for employee in employees), filename, mode)
             
     @staticmethod
     def write_to_csv(employees, filename):
-        with open(filename, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=employees[0].to_dict().keys(), delimiter=';')
-            writer.writeheader()
-            for employee in employees:
-                writer.writerow(employee.to_dict())
+        writers.write_csv_rows((list(employee.to_dict().values()) for employee in employees), filename,
+                               fieldnames=Employee.FIELDS)
 
     @staticmethod
     def parse_date(value: str) -> datetime:
@@ -39,35 +40,39 @@ class Employee:
     def wage_fund(employees: list) -> int:
         sum = 0
         for emp in employees:
-            sum += emp.salary * 12 + round(0.03 * emp.salary if 'программист' in emp.position else 0) + 2000
+            sum += emp.annual_wage()
         return sum
     
     @staticmethod
     def diagram(employees: list):
         filename = input("Введите имя файла (без расширения), в который хотите сохранить диаграмму: ")
-        while not re.fullmatch(r'^(?!.*\.\.)(?!.*\.$)(?!^\.)(?!.*\/)(?!.*\\)[\w\-.]+$', 
-                                filename):
+        while not validation.FILENAME_PATTERN.fullmatch(filename):
             filename = input("Проверьте введое имя и повторите ввод: ")
         filepath = "diagrams/" + filename + ".png"
-        positions = [emp.position.replace(" ", "\n") for emp in employees]
-        pyplot.figure(figsize=(10, 6))
-        pyplot.bar(positions, [emp.salary for emp in employees])
-        pyplot.title("Размер оклада по должностям")
-        pyplot.xlabel("Должности")
-        pyplot.ylabel("Оклад")
-        pyplot.savefig(filepath, dpi=300)
+        Employee.save_diagram(employees, filepath)
         while(1):
             choose = input("Открыть окно с диаграммой? (y/n) ")
             if choose == 'y': 
+                from matplotlib import pyplot
+                pyplot.figure(figsize=(10, 6))
+                pyplot.imshow(pyplot.imread(filepath))
+                pyplot.axis('off')
                 pyplot.show()
                 pyplot.close()
                 break
             elif choose == 'n':
-                pyplot.close()
                 break
             else:
                 print("Проверьте ввод")
     
+    @staticmethod
+    def save_diagram(employees: list, filepath: str, stat: str = 'mean'):
+        # matplotlib импортируется только здесь: без него модуль грузится в разы быстрее
+        from charts import ChartSpec, SalaryChartRenderer
+        from EmployeeTable import EmployeeTable
+        SalaryChartRenderer().render(EmployeeTable.from_employees(employees), filepath,
+                                     ChartSpec(name='salary', title='Размер оклада по должностям', stat=stat))
+
     @property
     def last_name(self) -> str:
         return self.__last_name
@@ -99,6 +104,10 @@ class Employee:
     @property
     def premium(self) -> int:
         return self.__premium
+
+    @property
+    def is_programmer(self) -> bool:
+        return self.__programmer
     
     @property
     def full_name(self) -> str:
@@ -116,18 +125,20 @@ class Employee:
     @last_name.setter
     def last_name(self, value: str):
         if len(value) < 2:
-            raise ValueError('Фамилия не может состоять из такого количества букв')
-        if not re.fullmatch(r'^[А-Яа-яЁё]+$', value):
-            raise ValueError('Фамилия должна быть написана кириллицей')
+            raise ValueError(validation.LAST_NAME_LENGTH_MSG)
+        if not validation.NAME_PATTERN.fullmatch(value):
+            raise ValueError(validation.LAST_NAME_CYRILLIC_MSG)
         self.__last_name = capwords(value)
+        self.__changed()
 
     @first_name.setter
     def first_name(self, value: str):
         if len(value) < 2:
-            raise ValueError('Имя не может состоять из такого количества букв')
-        if not re.fullmatch(r'^[А-Яа-яЁё]+$', value):
-            raise ValueError('Имя должно быть написано кириллицей')
+            raise ValueError(validation.FIRST_NAME_LENGTH_MSG)
+        if not validation.NAME_PATTERN.fullmatch(value):
+            raise ValueError(validation.FIRST_NAME_CYRILLIC_MSG)
         self.__first_name = capwords(value)
+        self.__changed()
 
     @middle_name.setter
     def middle_name(self, value: str):
@@ -135,62 +146,83 @@ class Employee:
             self.__middle_name = None
         else:
             if len(value) < 3:
-                raise ValueError('Отчество не может состоять из такого количества букв')
-            if not re.fullmatch(r'^[А-Яа-яЁё]+$', value):
-                raise ValueError('Отчество должно быть написано кириллицей')
+                raise ValueError(validation.MIDDLE_NAME_LENGTH_MSG)
+            if not validation.NAME_PATTERN.fullmatch(value):
+                raise ValueError(validation.MIDDLE_NAME_CYRILLIC_MSG)
             self.__middle_name = capwords(value)
+        self.__changed()
 
     @position.setter
     def position(self, value: str):
         if len(value) < 2:
-            raise ValueError('Название должности не может состоять из такого количества букв')
-        self.__first_name = value
+            raise ValueError(validation.POSITION_MSG)
+        self.__position = value
+        self.__programmer = 'программист' in value
+        self.__changed()
 
     @hire_date.setter
     def hire_date(self, value: str):
         date = self.parse_date(value)
-        low_date = datetime(2000, 1, 1)
-        if (date > datetime.now().strftime('%d.%m.%Y') or date < low_date):
-            raise ValueError('Введена неверная дата')
+        if (date > datetime.now() or date.date() < validation.LOW_HIRE_DATE):
+            raise ValueError(validation.HIRE_DATE_MSG)
         self.__hire_date = date
+        self.__changed()
 
     @salary.setter
     def salary(self, value: int):
         if value < 0:
-            raise ValueError('Зарплата не может быть отрицательной')
+            raise ValueError(validation.SALARY_MSG)
         self.__salary = value
+        self.__changed()
 
     @sex.setter
     def sex(self, value: str):
-        if capwords(value) != 'М' or capwords(value) != 'Ж':
-            raise ValueError('Пол должен быть указан в формате М/Ж')
+        value = capwords(value)
+        if value not in validation.SEXES:
+            raise ValueError(validation.SEX_MSG)
         self.__sex = value
+        self.__changed()
+
+    def subscribe(self, listener):
+        # listener.employee_changed(employee) вызывается после изменения любого поля или премии
+        if self.__listeners is None:
+            self.__listeners = []
+        self.__listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.__listeners.remove(listener)
+
+    def __changed(self):
+        if self.__listeners:
+            for listener in self.__listeners:
+                listener.employee_changed(self)
     
     def prem_prog(self):
-        if 'программист' in self.__position:
+        if self.__programmer:
             self.__premium += self.__salary * 0.03
+            self.__changed()
         
     def prem_wom(self) -> int:
         if self.__sex == 'Ж':
             self.__premium += 2000
+            self.__changed()
 
     def prem_man(self) -> int:
         if self.__sex == 'М':
             self.__premium += 2000
+            self.__changed()
     
-    def index(self):
-        if relativedelta(datetime.now(), self.__hire_date).years >= 10:
-            self.__salary = round(self.__salary * 1.07)
-        else:
-            self.__salary = round(self.__salary * 1.05)
+    def index(self, service: Optional[tenure.Tenure] = None):
+        service = service or tenure.current()
+        self.__salary = round(self.__salary * service.index_rate(self))
+        self.__changed()
         
-    def rest(self) -> bool:
-        difference = relativedelta(datetime.now(), self.__hire_date)
-        if difference.years > 0 or difference.months > 5:
-            return True
-        else:
-            return False
+    def rest(self, service: Optional[tenure.Tenure] = None) -> bool:
+        return (service or tenure.current()).rest(self)
     
+    def annual_wage(self) -> int:
+        return self.__salary * 12 + round(0.03 * self.__salary if self.__programmer else 0) + 2000
+
     def to_dict(self) -> dict:
         return {
             "ФИО": self.full_name,
@@ -202,31 +234,37 @@ class Employee:
         }
     
     def taxes_counter(self) -> dict:
+        # Результат зависит только от оклада, пола и должности, поэтому берётся из кэша по этим значениям:
+        # после index() или смены оклада ключ другой, и расчёт выполняется заново
+        return tax_cache.default().get(self.__salary, self.__sex, self.__programmer, Employee.taxes_schedule)
+
+    @staticmethod
+    def taxes_schedule(salary: int, sex: str, programmer: bool) -> dict:
         sum_salary_prem = 0
         result = {}
         total_sum = 0
         for month in range(1, 13):
             month_prem = 0
-            if (month == 2 and self.__sex == 'М') or (month == 3 and self.__sex == 'Ж'):
+            if (month == 2 and sex == 'М') or (month == 3 and sex == 'Ж'):
                 month_prem += 2000
-            if (month == 9 and 'программист' in self.__position):
-                month_prem += self.__salary * 0.03
-            if sum_salary_prem + self.__salary + month_prem <= 5000000:
-                personal_inc_tax = round((self.__salary + month_prem) * 0.13, 2)
+            if (month == 9 and programmer):
+                month_prem += salary * 0.03
+            if sum_salary_prem + salary + month_prem <= 5000000:
+                personal_inc_tax = round((salary + month_prem) * 0.13, 2)
             elif sum_salary_prem <= 5000000:
                 temp = 5000000 - sum_salary_prem
-                personal_inc_tax = round(temp * 0.13 + (self.__salary + month_prem - temp) * 0.15, 2)
+                personal_inc_tax = round(temp * 0.13 + (salary + month_prem - temp) * 0.15, 2)
             else:
-                personal_inc_tax = round(self.__salary * 0.15, 2)
-            sum_salary_prem += self.__salary + month_prem
-            month_sum = self.__salary + round((self.__salary + month_prem) * 0.3, 2)
+                personal_inc_tax = round(salary * 0.15, 2)
+            sum_salary_prem += salary + month_prem
+            month_sum = salary + round((salary + month_prem) * 0.3, 2)
             total_sum += month_sum
             result[month] = {
-                'salary': self.__salary,
+                'salary': salary,
                 'premium': month_prem,
                 'taxes': {
                     'НДФЛ': personal_inc_tax,
-                    'ФСС': round((self.__salary + month_prem) * 0.3, 2)
+                    'ФСС': round((salary + month_prem) * 0.3, 2)
                 },
                 'month_sum': month_sum
             }
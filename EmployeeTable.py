@@ -0,0 +1,125 @@
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, Optional, Sequence
+from Employee import Employee
+from taxes import TaxTable, compute_taxes
+from tenure import INDEX_RATE, REST_MONTHS, SENIOR_INDEX_RATE, SENIOR_MONTHS, months_of_service
+import numpy
+
+CATEGORY_OTHER = 0
+CATEGORY_PROGRAMMER = 1
+
+
+def position_category(position: str) -> int:
+    return CATEGORY_PROGRAMMER if 'программист' in position else CATEGORY_OTHER
+
+
+class EmployeeTable:
+    def __init__(self, last_names: Sequence[str], first_names: Sequence[str], middle_names: Sequence[Optional[str]],
+                 positions: Sequence[str], hire_dates: numpy.ndarray, salary: numpy.ndarray, sex: numpy.ndarray,
+                 premium: Optional[numpy.ndarray] = None, position_code: Optional[numpy.ndarray] = None):
+        # Столбцы имён могут быть любыми последовательностями, например ленивыми столбцами снимка
+        self.last_names = last_names if isinstance(last_names, Sequence) else list(last_names)
+        self.first_names = first_names if isinstance(first_names, Sequence) else list(first_names)
+        self.middle_names = middle_names if isinstance(middle_names, Sequence) else list(middle_names)
+        if position_code is None:
+            # positions - должность каждого сотрудника
+            self.positions, position_code = numpy.unique(numpy.asarray(positions, dtype=str), return_inverse=True)
+            self.positions = self.positions.tolist()
+        else:
+            # positions - список различных должностей, position_code - индексы в нём
+            self.positions = list(positions)
+        self.position_code = numpy.asarray(position_code).astype(numpy.int32, copy=False).reshape(-1)
+        position_category_of = numpy.array([position_category(pos) for pos in self.positions], dtype=numpy.int8)
+        self.category = position_category_of[self.position_code] if len(self.positions) else numpy.zeros(0, numpy.int8)
+        self.hire_date = numpy.asarray(hire_dates, dtype='datetime64[D]')
+        self.salary = numpy.asarray(salary, dtype=numpy.int64)
+        self.sex = numpy.asarray(sex, dtype=str)
+        size = len(self.salary)
+        self.premium = numpy.zeros(size) if premium is None else numpy.asarray(premium, dtype=numpy.float64)
+        # Премия программистам дробная - запоминаем, чтобы отдавать float, как Employee
+        self._premium_float = numpy.zeros(size, dtype=bool)
+        self._rows_by_name = None
+
+    @classmethod
+    def from_employees(cls, employees: Iterable[Employee]) -> 'EmployeeTable':
+        employees = list(employees)
+        table = cls(
+            last_names=[emp.last_name for emp in employees],
+            first_names=[emp.first_name for emp in employees],
+            middle_names=[emp.middle_name for emp in employees],
+            positions=[emp.position for emp in employees],
+            hire_dates=numpy.array([emp.hire_date.date() for emp in employees], dtype='datetime64[D]'),
+            salary=numpy.array([emp.salary for emp in employees], dtype=numpy.int64),
+            sex=numpy.array([emp.sex for emp in employees], dtype=str),
+            premium=numpy.array([emp.premium for emp in employees], dtype=numpy.float64),
+        )
+        table._premium_float = numpy.array([isinstance(emp.premium, float) for emp in employees], dtype=bool)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.salary)
+
+    def __iter__(self) -> Iterator[Employee]:
+        for i in range(len(self)):
+            yield self.employee(i)
+
+    def employee(self, i: int) -> Employee:
+        premium = self.premium[i]
+        return Employee(
+            last_name=self.last_names[i],
+            first_name=self.first_names[i],
+            middle_name=self.middle_names[i],
+            position=self.positions[self.position_code[i]],
+            hire_date=datetime.combine(self.hire_date[i].item(), datetime.min.time()),
+            salary=int(self.salary[i]),
+            sex=str(self.sex[i]),
+            premium=float(premium) if self._premium_float[i] else int(premium),
+        )
+
+    def to_employees(self) -> List[Employee]:
+        return list(self)
+
+    @property
+    def full_names(self) -> List[str]:
+        return [f'{last} {first}{(" " + middle) if middle else ""}'
+                for last, first, middle in zip(self.last_names, self.first_names, self.middle_names)]
+
+    def find(self, full_name: str) -> List[int]:
+        # Имена в таблице не меняются, поэтому индекс строится один раз
+        if self._rows_by_name is None:
+            self._rows_by_name = {}
+            for row, name in enumerate(self.full_names):
+                self._rows_by_name.setdefault(name, []).append(row)
+        return list(self._rows_by_name.get(full_name, ()))
+
+    @property
+    def programmer(self) -> numpy.ndarray:
+        return self.category == CATEGORY_PROGRAMMER
+
+    def prem_prog(self):
+        mask = self.programmer
+        self.premium[mask] += self.salary[mask] * 0.03
+        self._premium_float |= mask
+
+    def prem_wom(self):
+        self.premium[self.sex == 'Ж'] += 2000
+
+    def prem_man(self):
+        self.premium[self.sex == 'М'] += 2000
+
+    def indexed_salary(self, as_of: Optional[date] = None) -> numpy.ndarray:
+        rate = numpy.where(months_of_service(self.hire_date, as_of) >= SENIOR_MONTHS, SENIOR_INDEX_RATE, INDEX_RATE)
+        return numpy.rint(self.salary * rate).astype(numpy.int64)
+
+    def index(self, as_of: Optional[date] = None):
+        self.salary = self.indexed_salary(as_of)
+
+    def rest(self, as_of: Optional[date] = None) -> numpy.ndarray:
+        return months_of_service(self.hire_date, as_of) >= REST_MONTHS
+
+    def wage_fund(self) -> int:
+        prog_premium = numpy.where(self.programmer, numpy.rint(0.03 * self.salary), 0).astype(numpy.int64)
+        return int((self.salary * 12 + prog_premium + 2000).sum())
+
+    def taxes(self) -> TaxTable:
+        return compute_taxes(self.salary, self.sex, self.programmer)
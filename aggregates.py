@@ -0,0 +1,132 @@
+from typing import Dict, Iterable, List, NamedTuple
+from Employee import Employee
+
+
+class Totals:
+    # Денежные суммы храним в копейках, чтобы многократные += и -= не копили погрешность
+    def __init__(self):
+        self.count = 0
+        self.salary = 0
+        self.premium_kopecks = 0
+        self.wage_fund = 0
+
+    @property
+    def premium(self) -> float:
+        return self.premium_kopecks / 100
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Totals):
+            return NotImplemented
+        return ((self.count, self.salary, self.premium_kopecks, self.wage_fund)
+                == (other.count, other.salary, other.premium_kopecks, other.wage_fund))
+
+    def copy(self) -> 'Totals':
+        totals = Totals()
+        totals.count, totals.salary, totals.premium_kopecks, totals.wage_fund = (
+            self.count, self.salary, self.premium_kopecks, self.wage_fund)
+        return totals
+
+    def __repr__(self) -> str:
+        return (f'Totals(count={self.count}, salary={self.salary}, premium={self.premium}, '
+                f'wage_fund={self.wage_fund})')
+
+
+class _Contribution(NamedTuple):
+    position: str
+    sex: str
+    salary: int
+    premium_kopecks: int
+    wage_fund: int
+    taxes_kopecks: int
+
+
+def _kopecks(value: float) -> int:
+    return round(value * 100)
+
+
+class PayrollAggregate:
+    def __init__(self, employees: Iterable[Employee] = ()):
+        self._contributions: Dict[Employee, _Contribution] = {}
+        self.total = Totals()
+        self.by_position: Dict[str, Totals] = {}
+        self.by_sex: Dict[str, Totals] = {}
+        self._taxes_kopecks = 0
+        for employee in employees:
+            self.add(employee)
+
+    def add(self, employee: Employee):
+        if employee in self._contributions:
+            return
+        contribution = self._contribution(employee)
+        self._apply(contribution, 1)
+        self._contributions[employee] = contribution
+        employee.subscribe(self)
+
+    def remove(self, employee: Employee):
+        self._apply(self._contributions.pop(employee), -1)
+        employee.unsubscribe(self)
+
+    def employee_changed(self, employee: Employee):
+        # Вычитаем старый вклад сотрудника и прибавляем новый - O(1) на изменение
+        old = self._contributions[employee]
+        new = self._contribution(employee)
+        self._apply(old, -1)
+        self._apply(new, 1)
+        self._contributions[employee] = new
+
+    @property
+    def wage_fund(self) -> int:
+        return self.total.wage_fund
+
+    @property
+    def taxes_total(self) -> float:
+        return self._taxes_kopecks / 100
+
+    def employee_taxes_total(self, employee: Employee) -> float:
+        return self._contributions[employee].taxes_kopecks / 100
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    def employees(self) -> List[Employee]:
+        return list(self._contributions)
+
+    def state(self) -> tuple:
+        # Копия всех итогов - чтобы сравнить "до" и "после" сценария или с полным пересчётом
+        return (self.total.copy(), {key: totals.copy() for key, totals in self.by_position.items()},
+                {key: totals.copy() for key, totals in self.by_sex.items()}, self._taxes_kopecks)
+
+    def rescan(self) -> tuple:
+        # Итоги, посчитанные заново по всем сотрудникам, в том же виде, что и state()
+        full = PayrollAggregate()
+        for employee in self._contributions:
+            full._apply(full._contribution(employee), 1)
+        return full.state()
+
+    def verify(self) -> bool:
+        return self.state() == self.rescan()
+
+    @staticmethod
+    def _contribution(employee: Employee) -> _Contribution:
+        return _Contribution(
+            position=employee.position,
+            sex=employee.sex,
+            salary=employee.salary,
+            premium_kopecks=_kopecks(employee.premium),
+            wage_fund=employee.annual_wage(),
+            taxes_kopecks=_kopecks(employee.taxes_counter()[13])
+        )
+
+    def _apply(self, contribution: _Contribution, sign: int):
+        for totals in (self.total,
+                       self.by_position.setdefault(contribution.position, Totals()),
+                       self.by_sex.setdefault(contribution.sex, Totals())):
+            totals.count += sign
+            totals.salary += sign * contribution.salary
+            totals.premium_kopecks += sign * contribution.premium_kopecks
+            totals.wage_fund += sign * contribution.wage_fund
+        self._taxes_kopecks += sign * contribution.taxes_kopecks
+        if sign < 0:
+            for groups, key in ((self.by_position, contribution.position), (self.by_sex, contribution.sex)):
+                if not groups[key].count:
+                    del groups[key]
@@ -1,32 +1,18 @@
-from typing import List
-from string import capwords
+from typing import List, Optional
 from texts import START_MSG, WRITE_FILE_MSG, MAN_WOMAN_PREM, TAXES_TEXT
 from Employee import Employee
-import csv, os, time, re, json
+from EmployeeTable import EmployeeTable
+from loader import ParseReport, iter_employees, load_table
+from reports import render_schedule, write_table_report
+from storage import STORE_ENV, EmployeeStore, open_store
+from validation import FILENAME_PATTERN
+from writers import write_json_object
+import os, profiling, time, re
 
 CSV_FILE_PATH = './task.csv' 
 
-def read_employees_from_csv(file_path: str) -> List[Employee]:
-    employees = []
-    with open(file_path, 'r', encoding='utf-8') as csvfile:
-        reader = csv.reader(csvfile, delimiter=';')
-        next(reader)
-        for row in reader:
-            name_parts = row[0].split()
-            last_name = name_parts[0]
-            first_name = name_parts[1]
-            middle_name = name_parts[2] if len(name_parts) > 2 else None
-            employee = Employee(
-                last_name=last_name,
-                first_name=first_name,
-                middle_name=middle_name,
-                position=row[1],
-                hire_date=Employee.parse_date(row[2]),
-                salary=int(row[3].replace(' ', '')),
-                sex=capwords(row[4])
-            )
-            employees.append(employee)
-    return employees
+def read_employees_from_csv(file_path: str, report: Optional[ParseReport] = None) -> List[Employee]:
+    return list(iter_employees(file_path, report))
 
 
 def clear():
@@ -35,10 +21,7 @@ def clear():
     else:
         os.system('clear')
     
-employees = read_employees_from_csv(CSV_FILE_PATH)
-exit_flag = False
-
-def write_to_file(file_type: str) -> bool:
+def write_to_file(table: EmployeeTable, file_type: str) -> bool:
     filename_flag = False
     clear()
     print(f"Выбрана запись в {file_type} файл")
@@ -47,10 +30,11 @@ def write_to_file(file_type: str) -> bool:
         filename_flag = True
         print(filename_flag)
         file_name = user_file_name + file_type
-        if (file_type) == ".csv":
-            Employee.write_to_csv(employees, f'csv/{file_name}')
-        else:
-            Employee.write_to_json(employees, f'json/{file_name}')
+        with profiling.operation(f'export {file_type}', len(table)):
+            if (file_type) == ".csv":
+                Employee.write_to_csv(table.to_employees(), f'csv/{file_name}')
+            else:
+                Employee.write_to_json(table.to_employees(), f'json/{file_name}')
         clear()
         print(f'Файл записан в: {file_name}')
     else:
@@ -59,195 +43,219 @@ def write_to_file(file_type: str) -> bool:
     return filename_flag
 
 
+def apply(table: EmployeeTable, store: Optional[EmployeeStore], method: str):
+    with profiling.operation(method, len(table)):
+        getattr(table, method)()
+        if store is not None:
+            getattr(store, method)()
+
+
 def tax_parser(data: dict) -> str:
-    MONTHS = ("январь", "февраль", "март", "апрель", "май", "июнь",
-              "июль", "август", "сентябрь", "октябрь", "ноябрь", "декабрь", "итого")
-    text = ""
-    for month, details in data.items():
-        if month != 13:
-            text +=\
-f'''Данные на {MONTHS[month - 1]}:
-    Оклад: {details['salary']}
-    Премия: {details['premium']}
-    Налоги
-        НДФЛ: {details['taxes']['НДФЛ']}
-        ФСС: {details['taxes']['ФСС']}
-    Итоговая сумма на выплату работодателем за месяц: {details['month_sum']}
-'''
+    return render_schedule(data)
+
+
+def main():
+    profiling.enable_from_env()
+    parse_report = ParseReport()
+    store_path = os.environ.get(STORE_ENV)
+    store = open_store(store_path) if store_path else None
+    with profiling.operation('load') as operation:
+        if store is None:
+            table = load_table(CSV_FILE_PATH, parse_report)
         else:
-            text += '-' * 40
-            text += f"\nСумма всех выплат за год: {data[13]}\n"
-    return text
-
-
-while(not exit_flag):
-    try:
-        print(START_MSG)
-        choose = input("Ваш выбор: ")
-        if choose == '0':
-            flag = False
-            while(not flag):
-                clear()
-                print(WRITE_FILE_MSG)
-                choose_write = input("Ваш выбор: ")
-                if choose_write == '9': # назад
+            if not len(store):
+                store.import_csv(CSV_FILE_PATH, parse_report)
+            table = store.table()
+        operation.rows = len(table)
+    if parse_report:
+        print(parse_report, '\n')
+    exit_flag = False
+
+    while(not exit_flag):
+        try:
+            print(START_MSG)
+            choose = input("Ваш выбор: ")
+            if choose == '0':
+                flag = False
+                while(not flag):
                     clear()
-                    flag = True
-
-                elif choose_write == '1': # json
-                    filename_flag = False
-                    while(not filename_flag):
-                        filename_flag = write_to_file(".json")
-                    flag = True
-
-                elif choose_write == '2': # csv
-                    filename_flag = False
-                    while(not filename_flag):
-                        filename_flag = write_to_file(".csv")
-                    flag = True
-
-                else:
-                    print('Проверьте ввод')
-                    time.sleep(0.7)
+                    print(WRITE_FILE_MSG)
+                    choose_write = input("Ваш выбор: ")
+                    if choose_write == '9': # назад
+                        clear()
+                        flag = True
+
+                    elif choose_write == '1': # json
+                        filename_flag = False
+                        while(not filename_flag):
+                            filename_flag = write_to_file(table, ".json")
+                        flag = True
+
+                    elif choose_write == '2': # csv
+                        filename_flag = False
+                        while(not filename_flag):
+                            filename_flag = write_to_file(table, ".csv")
+                        flag = True
+
+                    else:
+                        print('Проверьте ввод')
+                        time.sleep(0.7)
                     
-        elif choose == '1': # Вывод текущих данных
-            clear()
-            for emp in employees:
-                print(emp.print_everything, '\n')
+            elif choose == '1': # Вывод текущих данных
+                clear()
+                for emp in table:
+                    print(emp.print_everything, '\n')
 
-        elif choose == '2': # Расчёт премии ко дню программиста
-            for emp in employees:
-                emp.prem_prog()
-            clear()
-            print('Программистам начислена премия')
+            elif choose == '2': # Расчёт премии ко дню программиста
+                apply(table, store, 'prem_prog')
+                clear()
+                print('Программистам начислена премия')
 
-        elif choose == '3': # Расчёт премии к 8 марта и 23 февраля
-            clear()
-            flag = False
-            while(not flag):
+            elif choose == '3': # Расчёт премии к 8 марта и 23 февраля
                 clear()
-                print(MAN_WOMAN_PREM)
-                choose_man_wom = input("Ваш выбор: ")
-                if choose_man_wom == '9': # назад
-                    clear()
-                    flag = True
-                elif choose_man_wom == '1': # 23.02
-                    flag = True
-                    for emp in employees:
-                        emp.prem_man()
-                    clear()
-                    print('Начислены премии мужчинам')
-                elif choose_man_wom == '2': # 8.03
-                    flag = True
-                    for emp in employees:
-                        emp.prem_wom()
+                flag = False
+                while(not flag):
                     clear()
-                    print('Начислены премии женщинам')
-                else:
-                    print('Проверьте ввод')
-                    time.sleep(0.7)
-
-        elif choose == '4': # Расчёт индексации зарплат
-            for emp in employees:
-                emp.index()
-            clear()
-            print("Зарплаты проиндексированы")
+                    print(MAN_WOMAN_PREM)
+                    choose_man_wom = input("Ваш выбор: ")
+                    if choose_man_wom == '9': # назад
+                        clear()
+                        flag = True
+                    elif choose_man_wom == '1': # 23.02
+                        flag = True
+                        apply(table, store, 'prem_man')
+                        clear()
+                        print('Начислены премии мужчинам')
+                    elif choose_man_wom == '2': # 8.03
+                        flag = True
+                        apply(table, store, 'prem_wom')
+                        clear()
+                        print('Начислены премии женщинам')
+                    else:
+                        print('Проверьте ввод')
+                        time.sleep(0.7)
 
-        elif choose == '5': # Получить список сотрудников, которым положен отпуск
-            clear()
-            print("Отпуск положен следующим сотрудникам:")
-            for emp in employees:
-                if emp.rest():
-                    print("  ", emp.full_name)
-            print()
+            elif choose == '4': # Расчёт индексации зарплат
+                apply(table, store, 'index')
+                clear()
+                print("Зарплаты проиндексированы")
 
-        elif choose == '6': # Расчитать фонд оплаты труда
-            clear()
-            print(f"Годовой фонд оплаты труда: {Employee.wage_fund(employees)} рублей")
+            elif choose == '5': # Получить список сотрудников, которым положен отпуск
+                clear()
+                print("Отпуск положен следующим сотрудникам:")
+                with profiling.operation('rest', len(table)):
+                    for name, rest in zip(table.full_names, table.rest()):
+                        if rest:
+                            print("  ", name)
+                print()
 
-        elif choose == '7':
-            clear()
-            Employee.diagram(employees)
+            elif choose == '6': # Расчитать фонд оплаты труда
+                clear()
+                with profiling.operation('wage_fund', len(table)):
+                    wage_fund = table.wage_fund()
+                print(f"Годовой фонд оплаты труда: {wage_fund} рублей")
 
-        elif choose == '8':
-            clear()
-            print(TAXES_TEXT)
-            while(1):
-                tax_choose = input("Ваш выбор: ")
-                if tax_choose == '1':
-                    clear()
-                    print("Список сотрудников: ")
-                    counter = 1
-                    for emp in employees:
-                        print(f'{counter}. {emp.full_name}')
-                        counter += 1
-                    while(1):
-                        emp_choose = input("Выберите сотрудника (используйте номер из списка выше): ")
-                        if re.fullmatch(r'\d+', emp_choose):
-                            emp_choose = int(emp_choose)
-                            if emp_choose > 0 and emp_choose <= counter:
-                                clear()
-                                taxes = Employee.taxes_counter(employees[emp_choose-1])
-                                print(f'Для сотрудника {employees[emp_choose-1].full_name}:')
-                                print(tax_parser(taxes))
-                                print(\
-f'''Желаете сохранить данные для "{employees[emp_choose-1].full_name}" в json файл?
+            elif choose == '7':
+                clear()
+                Employee.diagram(table.to_employees())
+
+            elif choose == '8':
+                clear()
+                print(TAXES_TEXT)
+                while(1):
+                    tax_choose = input("Ваш выбор: ")
+                    if tax_choose == '1':
+                        clear()
+                        print("Список сотрудников: ")
+                        counter = 1
+                        for name in table.full_names:
+                            print(f'{counter}. {name}')
+                            counter += 1
+                        while(1):
+                            emp_choose = input("Выберите сотрудника (используйте номер из списка выше или ФИО): ").strip()
+                            found = table.find(emp_choose)
+                            if found:
+                                emp_choose = str(found[0] + 1)
+                            if re.fullmatch(r'\d+', emp_choose):
+                                emp_choose = int(emp_choose)
+                                if emp_choose > 0 and emp_choose < counter:
+                                    clear()
+                                    employee = table.employee(emp_choose-1)
+                                    with profiling.operation('taxes', 1):
+                                        taxes = employee.taxes_counter()
+                                        print(f'Для сотрудника {employee.full_name}:')
+                                        print(tax_parser(taxes))
+                                    print(\
+f'''Желаете сохранить данные для "{employee.full_name}" в json файл?
     1. Да
     Нет - любое другое значение''')
-                                save_choose = input('Ваш выбор: ')
-                                if save_choose == '1':
-                                    filename = input("Введите имя файла (без расширения), в который хотите сохранить результат: ")
-                                    while not re.fullmatch(r'^(?!.*\.\.)(?!.*\.$)(?!^\.)(?!.*\/)(?!.*\\)[\w\-.]+$', 
-                                                           filename):
-                                        filename = input("Проверьте введое имя и повторите ввод: ")
-                                    filepath = f'json/{filename}.json'
-                                    emp_dict = {employees[emp_choose-1].full_name: taxes}
-                                    with open(filepath, 'w', encoding='utf-8') as file:
-                                        json.dump(emp_dict, fp=file, ensure_ascii=False, indent=4)
-                                    clear()
-                                    print(f'Данные по сотруднику "{employees[emp_choose-1].full_name}" успешно сохранены в: "{filepath}"\n')
+                                    save_choose = input('Ваш выбор: ')
+                                    if save_choose == '1':
+                                        filename = input("Введите имя файла (без расширения), в который хотите сохранить результат: ")
+                                        while not FILENAME_PATTERN.fullmatch(filename):
+                                            filename = input("Проверьте введое имя и повторите ввод: ")
+                                        filepath = f'json/{filename}.json'
+                                        write_json_object([(employee.full_name, taxes)], filepath)
+                                        clear()
+                                        print(f'Данные по сотруднику "{employee.full_name}" успешно сохранены в: "{filepath}"\n')
+                                    else:
+                                        clear()
+                                    break
                                 else:
-                                    clear()
-                                break
+                                    print("Проверьте ввод")
                             else:
-                                print("Проверьте ввод")
-                        else:
-                            print('Проверьте ввод')
-                    break
-                elif tax_choose == '2': # все в json
-                    filename = input("Введите имя файла (без расширения), в который хотите сохранить результат: ")
-                    while not re.fullmatch(r'^(?!.*\.\.)(?!.*\.$)(?!^\.)(?!.*\/)(?!.*\\)[\w\-.]+$', 
-                                filename):
-                        filename = input("Проверьте введое имя и повторите ввод: ")
-                    filepath = f'json/{filename}.json'
-                    emp_dict = {emp.full_name: Employee.taxes_counter(emp) for emp in employees}
-                    with open(filepath, 'w', encoding='utf-8') as file:
-                        json.dump(emp_dict, fp=file, ensure_ascii=False, indent=4)
-                    clear()
-                    print(f'Налоговые отчисления успешно сохранены в: {filepath}\n')
-                    break                    
-                elif tax_choose == '9':
-                    clear()
-                    break
-                else:
-                    print("Проверьте ввод")
-            # дописать функционал: вывод списка сотрудников, сохранение json для всех сотрудников, сохранение json для конкретного сотрудника
+                                print('Проверьте ввод')
+                        break
+                    elif tax_choose == '2': # все в json
+                        filename = input("Введите имя файла (без расширения), в который хотите сохранить результат: ")
+                        while not FILENAME_PATTERN.fullmatch(filename):
+                            filename = input("Проверьте введое имя и повторите ввод: ")
+                        filepath = f'json/{filename}.json'
+                        with profiling.operation('taxes export', len(table)):
+                            write_json_object(table.taxes().unique_items(table.full_names), filepath)
+                        clear()
+                        print(f'Налоговые отчисления успешно сохранены в: {filepath}\n')
+                        break
+                    elif tax_choose == '3': # отчёт по всем в txt
+                        filename = input("Введите имя файла (без расширения), в который хотите сохранить отчёт: ")
+                        while not FILENAME_PATTERN.fullmatch(filename):
+                            filename = input("Проверьте введое имя и повторите ввод: ")
+                        os.makedirs('reports', exist_ok=True)
+                        filepath = f'reports/{filename}.txt'
+                        with profiling.operation('taxes report', len(table)):
+                            write_table_report(table.taxes(), table.full_names, filepath)
+                        clear()
+                        print(f'Отчёт по налоговым отчислениям сохранён в: {filepath}\n')
+                        break
+                    elif tax_choose == '9':
+                        clear()
+                        break
+                    else:
+                        print("Проверьте ввод")
+                # дописать функционал: вывод списка сотрудников, сохранение json для всех сотрудников, сохранение json для конкретного сотрудника
 
-        elif choose == '9': # Выход из программы
-            exit_flag = True
-        else:
+            elif choose == '9': # Выход из программы
+                exit_flag = True
+            else:
+                clear()
+                print("Проверьте введённые данные")
+
+        except ValueError: 
             clear()
-            print("Проверьте введённые данные")
+            print('Проверьте ввод')
 
-    except ValueError: 
-        clear()
-        print('Проверьте ввод')
+        except KeyboardInterrupt:
+            exit_flag = True
+            print()
 
-    except KeyboardInterrupt:
-        exit_flag = True
-        print()
+        if exit_flag: 
+            print('Выход из программы...')
+            time.sleep(0.5)
+            clear()
+    if store is not None:
+        store.close()
+    profiling.finish()
 
-    if exit_flag: 
-        print('Выход из программы...')
-        time.sleep(0.5)
-        clear()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from argparse import ArgumentParser
+from datetime import datetime
+from timeit import timeit
+from types import GetSetDescriptorType, MemberDescriptorType
+import os, sys, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Employee import Employee
+from EmployeeTable import EmployeeTable
+
+# Тот же класс, но с обычным __dict__ у экземпляров - как Employee был устроен до __slots__
+DictEmployee = type('DictEmployee', (), {
+    name: value for name, value in vars(Employee).items()
+    if name != '__slots__' and not isinstance(value, (MemberDescriptorType, GetSetDescriptorType))
+})
+
+
+def make(cls, count: int) -> list:
+    hire_date = datetime(2015, 2, 22)
+    return [cls(last_name='Корнеева', first_name='Анна', middle_name='Игоревна', position='Ведущий программист',
+                hire_date=hire_date, salary=120000 + i, sex='Ж') for i in range(count)]
+
+
+def memory_per_instance(cls, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    employees = make(cls, count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Список и целые оклады одинаковы для обоих классов и в разницу не входят
+    overhead = sys.getsizeof(employees) + sum(sys.getsizeof(emp.salary) for emp in employees)
+    return (after - before - overhead) / count
+
+
+def table_memory_per_row(count: int) -> float:
+    employees = make(Employee, count)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = EmployeeTable.from_employees(employees)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(table)
+
+
+def access_time(cls, count: int, repeat: int) -> float:
+    employees = make(cls, count)
+    return timeit(lambda: [emp.salary + len(emp.position) for emp in employees], number=repeat) / (count * repeat)
+
+
+def main():
+    parser = ArgumentParser(description='Память и скорость доступа к атрибутам Employee')
+    parser.add_argument('-n', '--count', type=int, default=100000)
+    parser.add_argument('-r', '--repeat', type=int, default=10)
+    args = parser.parse_args()
+    print(f'{"класс":<14}{"байт/сотрудник":>16}{"нс/обращение":>14}')
+    for cls in (DictEmployee, Employee):
+        size = memory_per_instance(cls, args.count)
+        access = access_time(cls, args.count, args.repeat) * 1e9 / 2
+        print(f'{cls.__name__:<14}{size:>16.1f}{access:>14.1f}')
+    print(f'{"EmployeeTable":<14}{table_memory_per_row(args.count):>16.1f}{"-":>14}')
+
+
+if __name__ == '__main__':
+    main()
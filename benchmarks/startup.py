@@ -0,0 +1,41 @@
+from argparse import ArgumentParser
+from statistics import median
+import json, os, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('numpy', 'matplotlib', 'dateutil')
+MODULES = ('Employee', 'taxes', 'EmployeeTable', 'cli')
+
+# Время импорта замеряется в отдельном процессе, чтобы не мешал уже загруженный кэш модулей
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in {heavy!r} if name in sys.modules]]))
+'''
+
+
+def measure(module: str, repeat: int) -> tuple:
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        elapsed, loaded = json.loads(result.stdout)
+        times.append(elapsed)
+    return median(times), loaded
+
+
+def main():
+    parser = ArgumentParser(description='Время импорта модулей проекта')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    args = parser.parse_args()
+    print(f'{"модуль":<16}{"мс":>10}  загружены')
+    for module in args.modules:
+        elapsed, loaded = measure(module, args.repeat)
+        print(f'{module:<16}{elapsed * 1000:>10.1f}  {", ".join(loaded) or "-"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+from argparse import ArgumentParser
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Callable, Iterable, List, Optional
+import copy, json, os, platform, random, subprocess, sys, tempfile, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Вне зависимости от текущей папки; файл в .gitignore
+DEFAULT_OUTPUT = os.path.join(ROOT, 'bench_results.json')
+
+from Employee import Employee
+from app import read_employees_from_csv, tax_parser
+from loader import load_table
+from projection import project
+from taxes import compute_taxes
+import reports, tax_cache, tenure, writers
+
+SIZES = {'1k': 1000, '100k': 100000, '1m': 1000000}
+LAST_NAMES = ('Иванов', 'Петров', 'Сидоров', 'Струков', 'Кузнецов', 'Смирнов', 'Попов', 'Васильев')
+FEMALE_LAST_NAMES = ('Иванова', 'Петрова', 'Сорокина', 'Корнеева', 'Кузнецова', 'Смирнова', 'Савченко')
+MALE_FIRST_NAMES = ('Иван', 'Артем', 'Сергей', 'Пётр', 'Алексей', 'Дмитрий')
+FEMALE_FIRST_NAMES = ('Анна', 'Екатерина', 'Алина', 'Мария', 'Ольга', 'Елена')
+MIDDLE_NAMES = {'М': ('Иванович', 'Сергеевич', 'Андреевич'), 'Ж': ('Игоревна', 'Матвеевна', 'Сергеевна')}
+POSITIONS = ('Менеджер', 'Аналитик', 'Старший программист', 'Ведущий программист', 'Младший программист',
+             'Тестировщик', 'Бухгалтер')
+
+
+def generate_csv(path: str, rows: int, seed: int = 0):
+    # Тот же формат, что у task.csv: BOM, ";" и оклад с пробелом между разрядами
+    rng = random.Random(seed)
+    start = date(2000, 1, 1)
+    span = (date.today() - start).days
+    with open(path, 'w', encoding='utf-8-sig', newline='') as file:
+        file.write('ФИО;Должность;Дата найма;Оклад;Пол\n')
+        for _ in range(rows):
+            sex = rng.choice('МЖ')
+            last = rng.choice(LAST_NAMES if sex == 'М' else FEMALE_LAST_NAMES)
+            first = rng.choice(MALE_FIRST_NAMES if sex == 'М' else FEMALE_FIRST_NAMES)
+            name = f'{last} {first} {rng.choice(MIDDLE_NAMES[sex])}' if rng.random() < 0.9 else f'{last} {first}'
+            salary = f'{rng.randrange(30000, 700000, 1000):,}'.replace(',', ' ')
+            hire_date = (start + timedelta(days=rng.randrange(span))).strftime('%d.%m.%Y')
+            file.write(f'{name};{rng.choice(POSITIONS)};{hire_date};{salary};{rng.choice("МЖмж")}\n')
+
+
+class Suite:
+    def __init__(self, memory: bool):
+        self.memory = memory
+        self.results = []
+
+    def measure(self, size: str, rows: int, operation: str, func: Callable, setup: Optional[Callable] = None):
+        # Время и пиковая память - в разных прогонах: tracemalloc сильно замедляет код.
+        # setup вызывается перед каждым прогоном, поэтому изменяющие данные операции получают одинаковый вход
+        args = setup() if setup else ()
+        start = perf_counter()
+        func(*args)
+        seconds = perf_counter() - start
+        peak = None
+        if self.memory:
+            args = setup() if setup else ()
+            tracemalloc.start()
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.results.append({'size': size, 'rows': rows, 'operation': operation, 'seconds': seconds,
+                             'rows_per_second': rows / seconds if seconds else None, 'peak_bytes': peak})
+        peak_text = f'{peak / 2 ** 20:10.1f} МБ' if peak is not None else ''
+        print(f'{size:>5} {operation:<32}{seconds:10.3f} с{peak_text}', flush=True)
+
+
+def cold_tax_cache() -> tuple:
+    tax_cache.default().clear()
+    return ()
+
+
+def consume(results: Iterable):
+    # Результаты не копятся в памяти: на миллионе строк списки словарей и строк занимают гигабайты
+    for _ in results:
+        pass
+
+
+def run_size(suite: Suite, size: str, rows: int, workdir: str, seed: int):
+    csv_path = os.path.join(workdir, f'employees_{size}.csv')
+    generate_csv(csv_path, rows, seed)
+    base = load_table(csv_path)
+    # Изменяющие операции каждый раз работают с новой копией исходных данных
+    fresh_employees = lambda: (base.to_employees(),)
+    fresh_table = lambda: (copy.deepcopy(base),)
+    employees = base.to_employees()
+    as_of = tenure.Tenure()
+    names = base.full_names
+
+    suite.measure(size, rows, 'read_employees_from_csv', lambda: read_employees_from_csv(csv_path))
+    suite.measure(size, rows, 'load_table', lambda: load_table(csv_path))
+    for method in ('prem_prog', 'prem_man', 'prem_wom'):
+        suite.measure(size, rows, method, lambda staff, method=method: consume(getattr(emp, method)()
+                                                                              for emp in staff),
+                      setup=fresh_employees)
+    suite.measure(size, rows, 'index', lambda staff: consume(emp.index(as_of) for emp in staff), setup=fresh_employees)
+    suite.measure(size, rows, 'index (precomputed tenure)',
+                  lambda staff: (as_of.precompute(staff), consume(emp.index(as_of) for emp in staff)),
+                  setup=fresh_employees)
+    suite.measure(size, rows, 'rest', lambda: consume(emp.rest(as_of) for emp in employees))
+    suite.measure(size, rows, 'wage_fund', lambda: Employee.wage_fund(employees))
+    suite.measure(size, rows, 'taxes_counter (cold cache)', lambda: consume(emp.taxes_counter() for emp in employees),
+                  setup=cold_tax_cache)
+    suite.measure(size, rows, 'taxes_counter (warm cache)', lambda: consume(emp.taxes_counter() for emp in employees))
+    # Только форматирование: один и тот же заранее посчитанный расчёт (программист, с премией в сентябре)
+    schedule = Employee.taxes_schedule(250000, 'М', True)
+    suite.measure(size, rows, 'tax_parser', lambda: consume(tax_parser(schedule) for _ in range(rows)))
+    suite.measure(size, rows, 'write_to_json',
+                  lambda: Employee.write_to_json(employees, os.path.join(workdir, 'e.json')))
+    suite.measure(size, rows, 'write_to_csv',
+                  lambda: Employee.write_to_csv(employees, os.path.join(workdir, 'e.csv')))
+
+    suite.measure(size, rows, 'table.prem_* + index',
+                  lambda fresh: (fresh.prem_prog(), fresh.prem_man(), fresh.prem_wom(), fresh.index(as_of.as_of)),
+                  setup=fresh_table)
+    suite.measure(size, rows, 'table.wage_fund', base.wage_fund)
+    suite.measure(size, rows, 'compute_taxes', lambda: compute_taxes(base.salary, base.sex, base.programmer))
+    suite.measure(size, rows, 'projection (10 years)', lambda: project(base, 10, as_of.as_of))
+    taxes = base.taxes()
+    suite.measure(size, rows, 'write taxes json', lambda: writers.write_json_object(
+        taxes.items(names), os.path.join(workdir, 't.json')))
+    suite.measure(size, rows, 'write taxes report', lambda: reports.write_table_report(
+        taxes, names, os.path.join(workdir, 't.txt')))
+    os.remove(csv_path)
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    import numpy
+    return {'timestamp': datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+            'python': platform.python_version(), 'numpy': numpy.__version__, 'platform': platform.platform(),
+            'cpu_count': os.cpu_count()}
+
+
+def compare(results: List[dict], previous_path: str, threshold: float) -> int:
+    with open(previous_path, encoding='utf-8') as file:
+        previous = {(item['size'], item['operation']): item for item in json.load(file)['results']}
+    regressions = 0
+    print(f'\nСравнение с {previous_path}:')
+    for item in results:
+        old = previous.get((item['size'], item['operation']))
+        if not old or not old['seconds']:
+            continue
+        ratio = item['seconds'] / old['seconds']
+        mark = '  <-- медленнее' if ratio > 1 + threshold else ''
+        regressions += bool(mark)
+        print(f'{item["size"]:>5} {item["operation"]:<32}{ratio:8.2f}x{mark}')
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description='Замеры основных операций на синтетических данных')
+    parser.add_argument('--sizes', nargs='+', default=['1k', '100k'], choices=SIZES)
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help='json файл с результатами')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='не замерять пиковую память (быстрее)')
+    parser.add_argument('--compare', help='json файл предыдущего прогона для сравнения')
+    parser.add_argument('--threshold', type=float, default=0.2, help='допустимое замедление, доля')
+    args = parser.parse_args()
+
+    suite = Suite(memory=not args.no_memory)
+    with tempfile.TemporaryDirectory(prefix='payroll-bench-') as workdir:
+        for size in args.sizes:
+            run_size(suite, size, SIZES[size], workdir, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump({'environment': environment(), 'results': suite.results}, file, ensure_ascii=False, indent=4)
+    print(f'Результаты записаны в {args.output}')
+    if args.compare and compare(suite.results, args.compare, args.threshold):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from EmployeeTable import EmployeeTable
+import os, numpy
+
+STATS = ('mean', 'median', 'min', 'max', 'count')
+STAT_TITLES = {
+    'mean': 'Средний оклад',
+    'median': 'Медианный оклад',
+    'min': 'Минимальный оклад',
+    'max': 'Максимальный оклад',
+    'count': 'Количество сотрудников',
+}
+GROUPS = ('position', 'sex')
+
+
+class ChartSpec(NamedTuple):
+    name: str
+    title: str
+    group_by: str = 'position'
+    stat: str = 'mean'
+    mask: Optional[numpy.ndarray] = None
+    salary: Optional[numpy.ndarray] = None
+
+
+def group_salaries(codes: numpy.ndarray, salary: numpy.ndarray, labels: List[str]) -> Dict[str, object]:
+    # Сортируем по (группа, оклад): границы групп дают min/max/count, середины - медиану
+    order = numpy.lexsort((salary, codes))
+    codes, salary = codes[order], salary[order].astype(numpy.float64)
+    starts = numpy.flatnonzero(numpy.r_[True, codes[1:] != codes[:-1]]) if len(codes) else numpy.zeros(0, int)
+    count = numpy.diff(numpy.r_[starts, len(codes)])
+    ends = starts + count - 1
+    middle_low = starts + (count - 1) // 2
+    middle_high = starts + count // 2
+    return {
+        'labels': [labels[code] for code in codes[starts].tolist()],
+        'count': count,
+        'mean': numpy.add.reduceat(salary, starts) / count if len(starts) else numpy.zeros(0),
+        'median': (salary[middle_low] + salary[middle_high]) / 2,
+        'min': salary[starts],
+        'max': salary[ends],
+    }
+
+
+class SalaryChartRenderer:
+    # Одна фигура на весь прогон: между графиками она только очищается
+    def __init__(self, figsize: tuple = (10, 6), dpi: int = 150):
+        self.dpi = dpi
+        self.figure = Figure(figsize=figsize)
+        FigureCanvasAgg(self.figure)
+
+    def render(self, table: EmployeeTable, filepath: str, spec: Optional[ChartSpec] = None):
+        spec = spec or ChartSpec(name='salary', title='Размер оклада по должностям')
+        if spec.stat not in STATS:
+            raise ValueError(f'Неизвестная статистика: {spec.stat}')
+        if spec.group_by not in GROUPS:
+            raise ValueError(f'Неизвестная группировка: {spec.group_by}')
+        salary = table.salary if spec.salary is None else spec.salary
+        if spec.group_by == 'position':
+            codes, labels = table.position_code, [position.replace(' ', '\n') for position in table.positions]
+        else:
+            labels = ['М', 'Ж']
+            codes = numpy.where(table.sex == 'М', 0, 1)
+        if spec.mask is not None:
+            codes, salary = codes[spec.mask], salary[spec.mask]
+        groups = group_salaries(codes, salary, labels)
+
+        self.figure.clear()
+        axes = self.figure.add_subplot()
+        values = groups[spec.stat]
+        bars = axes.bar(groups['labels'], values)
+        if spec.stat in ('mean', 'median') and len(values):
+            # Разброс от минимального до максимального оклада в группе
+            axes.errorbar(groups['labels'], values, yerr=[values - groups['min'], groups['max'] - values],
+                          fmt='none', ecolor='black', capsize=4)
+        axes.bar_label(bars, labels=[f'n={count}' for count in groups['count'].tolist()], label_type='center')
+        axes.set_title(spec.title)
+        axes.set_xlabel('Должности' if spec.group_by == 'position' else 'Пол')
+        axes.set_ylabel(STAT_TITLES[spec.stat])
+        self.figure.tight_layout()
+        self.figure.savefig(filepath, dpi=self.dpi)
+
+    def render_batch(self, table: EmployeeTable, output_dir: str, specs: Iterable[ChartSpec]) -> List[str]:
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for spec in specs:
+            filepath = os.path.join(output_dir, spec.name + '.png')
+            self.render(table, filepath, spec)
+            paths.append(filepath)
+        return paths
+
+
+def standard_charts(table: EmployeeTable, stat: str = 'mean', as_of: Optional[date] = None) -> List[ChartSpec]:
+    # Отделов в данных нет, поэтому "по подразделениям" - это программисты и остальные сотрудники
+    programmer = table.programmer
+    return [
+        ChartSpec('positions', 'Размер оклада по должностям', stat=stat),
+        ChartSpec('programmers', 'Оклады программистов', stat=stat, mask=programmer),
+        ChartSpec('others', 'Оклады остальных сотрудников', stat=stat, mask=~programmer),
+        ChartSpec('sex', 'Размер оклада по полу', group_by='sex', stat=stat),
+        ChartSpec('men', 'Оклады мужчин по должностям', stat=stat, mask=table.sex == 'М'),
+        ChartSpec('women', 'Оклады женщин по должностям', stat=stat, mask=table.sex == 'Ж'),
+        ChartSpec('indexed', 'Размер оклада по должностям после индексации', stat=stat,
+                  salary=table.indexed_salary(as_of)),
+    ]
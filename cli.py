@@ -0,0 +1,445 @@
+from argparse import ArgumentParser, Namespace
+from time import perf_counter
+from typing import List, Optional
+from Employee import Employee
+from EmployeeTable import EmployeeTable
+from loader import BATCH_SIZE, ParseReport, iter_numbered_batches, load_table
+from snapshot import is_snapshot, open_snapshot, save_snapshot
+from storage import is_database, open_store
+from validation import validate_rows, validate_table
+from aggregates import PayrollAggregate
+from index import EmployeeIndex
+from app import CSV_FILE_PATH
+import parallel, profiling, reports, sys, tenure, writers
+
+PREMIUMS = ('prog', 'man', 'wom')
+
+
+def steps(args: Namespace) -> List[tuple]:
+    # (метод EmployeeTable, аргументы) - в таком виде шаги передаются и в процессы parallel.py
+    return ([(f'prem_{kind}', ()) for kind in args.premium or []]
+            + ([('index', (args.as_of,))] if args.index else []))
+
+
+def load(args: Namespace) -> EmployeeTable:
+    with profiling.operation('load') as operation:
+        if is_snapshot(args.input):
+            table = open_snapshot(args.input).table()
+        elif is_database(args.input):
+            with open_store(args.input) as store:
+                table = store.table()
+        else:
+            report = ParseReport()
+            table = load_table(args.input, report)
+            if report:
+                print(report, file=sys.stderr)
+        operation.rows = len(table)
+    for method, method_args in steps(args):
+        with profiling.operation(method, len(table)):
+            getattr(table, method)(*method_args)
+    return table
+
+
+def run_parallel(args: Namespace, job: str) -> int:
+    report = ParseReport()
+    with profiling.operation(f'parallel {job}') as operation:
+        count = parallel.run(job, args.input, args.output, workers=args.workers, chunk_size=args.chunk_size,
+                             mode=output_mode(args),
+                             steps=steps(args), report=report)
+        operation.rows = count
+    if report:
+        print(report, file=sys.stderr)
+    return count
+
+
+def is_csv_input(args: Namespace) -> bool:
+    # Параллельно обрабатывается только CSV; снимок и база читаются в одном процессе
+    return not is_snapshot(args.input) and not is_database(args.input)
+
+
+def output_mode(args: Namespace) -> str:
+    return writers.JSON_LINES if args.output.endswith('.jsonl') else args.mode
+
+
+def export_table(table: EmployeeTable, args: Namespace):
+    with profiling.operation('export', len(table)):
+        if args.output.endswith('.csv'):
+            Employee.write_to_csv(table, args.output)
+        else:
+            Employee.write_to_json(table, args.output, output_mode(args))
+
+
+def cmd_export(args: Namespace):
+    if args.workers and is_csv_input(args):
+        count = run_parallel(args, parallel.EXPORT)
+    else:
+        table = load(args)
+        export_table(table, args)
+        count = len(table)
+    print(f'Записано сотрудников: {count} в {args.output}')
+
+
+def cmd_premiums(args: Namespace):
+    args.premium = (args.premium or []) + args.kinds
+    table = load(args)
+    print(f'Сумма начисленных премий: {table.premium.sum():.2f}')
+    if args.output:
+        export_table(table, args)
+
+
+def cmd_index(args: Namespace):
+    args.index = True
+    table = load(args)
+    print(f'Зарплаты проиндексированы, фонд оплаты труда: {table.wage_fund()}')
+    if args.output:
+        export_table(table, args)
+
+
+def cmd_vacation(args: Namespace):
+    table = load(args)
+    with profiling.operation('rest', len(table)):
+        names = [name for name, rest in zip(table.full_names, table.rest(args.as_of)) if rest]
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.writelines(name + '\n' for name in names)
+    else:
+        for name in names:
+            print(name)
+
+
+def cmd_wage_fund(args: Namespace):
+    table = load(args)
+    with profiling.operation('wage_fund', len(table)):
+        wage_fund = table.wage_fund()
+    print(wage_fund)
+
+
+def cmd_taxes(args: Namespace):
+    if args.workers and args.output and not args.name and is_csv_input(args):
+        run_parallel(args, parallel.TAXES)
+        return
+    table = load(args)
+    names = table.full_names
+    if args.name:
+        rows = table.find(args.name)
+        if not rows:
+            raise SystemExit(f'Сотрудник "{args.name}" не найден')
+        employee = table.employee(rows[0])
+        pairs = [(employee.full_name, employee.taxes_counter())]
+        with profiling.operation('write taxes', 1):
+            if args.output:
+                writers.write_json_object(pairs, args.output, output_mode(args))
+            else:
+                reports.write_report(pairs, args.report)
+        return
+    if is_snapshot(args.input) and not steps(args) and open_snapshot(args.input).meta['taxes']:
+        taxes = open_snapshot(args.input).taxes()
+    else:
+        with profiling.operation('taxes', len(table)):
+            taxes = table.taxes()
+    # Отчисления по каждому сотруднику собираются лениво, поэтому их время входит в запись
+    with profiling.operation('write taxes', len(table)):
+        if args.output:
+            writers.write_json_object(taxes.unique_items(names), args.output, output_mode(args))
+        else:
+            reports.write_table_report(taxes, names, args.report)
+
+
+def cmd_snapshot(args: Namespace):
+    table = load(args)
+    with profiling.operation('save snapshot', len(table)):
+        save_snapshot(table, args.output, table.taxes() if args.taxes else None)
+    print(f'Снимок {len(table)} сотрудников сохранён в {args.output}')
+
+
+def cmd_validate(args: Namespace):
+    report = ParseReport()
+    checked = 0
+    failed = 0
+    if is_snapshot(args.input) or is_database(args.input):
+        # Номеров строк файла здесь нет - ошибки нумеруются по записям
+        table = load(args)
+        with profiling.operation('validate', len(table)):
+            errors = validate_table(table, args.as_of)
+        names = table.full_names
+        for error in errors:
+            print(f'запись {error.row + 1}: {names[error.row]}: {error.message}')
+        checked, failed = len(table), len({error.row for error in errors})
+    else:
+        # Проверяются исходные значения, а ошибки нумеруются строками файла - как в отчёте о разборе
+        for lines, rows in iter_numbered_batches(args.input, args.chunk_size, report):
+            with profiling.operation('validate', len(rows)):
+                errors = validate_rows(rows, args.as_of)
+            for error in errors:
+                last_name, first_name, middle_name = rows[error.row][:3]
+                name = f'{last_name} {first_name}{(" " + middle_name) if middle_name else ""}'
+                print(f'строка {lines[error.row]}: {name}: {error.message}')
+            failed += len({error.row for error in errors})
+            checked += len(rows)
+    if report:
+        print(report)
+    print(f'Проверено записей: {checked}, с ошибками: {failed}')
+    if failed or report:
+        raise SystemExit(1)
+
+
+SCENARIO_ACTIONS = ('index', 'prem_prog', 'prem_man', 'prem_wom')
+
+
+def select_employees(args: Namespace, employee_index: EmployeeIndex) -> List[Employee]:
+    # Условия объединяются через "и"; без условий выбираются все сотрудники
+    groups = []
+    if args.name:
+        found = []
+        for name in args.name:
+            employees = employee_index.find(name)
+            if not employees:
+                raise SystemExit(f'Сотрудник "{name}" не найден')
+            found.extend(employees)
+        groups.append(found)
+    if args.position:
+        groups.append([employee for position in args.position for employee in employee_index.with_position(position)])
+    if args.hired_since or args.hired_before:
+        groups.append(employee_index.hired_between(args.hired_since, args.hired_before))
+    if not groups:
+        return employee_index.employees()
+    selected = dict.fromkeys(min(groups, key=len))
+    for group in groups:
+        members = set(group)
+        selected = {employee: None for employee in selected if employee in members}
+    return list(selected)
+
+
+def cmd_employees(args: Namespace):
+    employees = load(args).to_employees()
+    with profiling.operation('select', len(employees)):
+        selected = select_employees(args, EmployeeIndex(employees))
+    for employee in selected:
+        print(f'{employee.full_name}; {employee.position}; {employee.hire_date.strftime("%d.%m.%Y")}; '
+              f'{employee.salary}')
+    print(f'Найдено сотрудников: {len(selected)}')
+
+
+def cmd_what_if(args: Namespace):
+    table = load(args)
+    employees = table.to_employees()
+    with profiling.operation('what-if totals', len(employees)):
+        aggregate = PayrollAggregate(employees)
+    employee_index = EmployeeIndex(employees)
+    before = aggregate.state()
+    service = tenure.Tenure(args.as_of)
+    start = perf_counter()
+    # Каждое изменение сотрудника сразу поправляет итоги - O(1) на сотрудника, без полного пересчёта
+    selected = select_employees(args, employee_index)
+    with profiling.operation('what-if scenario', len(selected)):
+        if 'index' in (args.do or []):
+            service.precompute(selected)
+        for employee in selected:
+            if args.set_salary is not None:
+                employee.salary = args.set_salary
+            if args.set_position:
+                employee.position = args.set_position
+            for action in args.do or []:
+                if action == 'index':
+                    employee.index(service)
+                else:
+                    getattr(employee, action)()
+    seconds = perf_counter() - start
+
+    (total_before, positions_before, _, taxes_before) = before
+    print(f'Сотрудников в сценарии: {len(selected)} из {len(aggregate)}, пересчёт итогов: {seconds:.3f} с')
+    print(f'{"":<28}{"было":>18}{"стало":>18}{"разница":>16}')
+    for title, old, new in (('Фонд оплаты труда', total_before.wage_fund, aggregate.wage_fund),
+                            ('Премии', total_before.premium, aggregate.total.premium),
+                            ('Выплаты с налогами за год', taxes_before / 100, aggregate.taxes_total)):
+        print(f'{title:<28}{old:>18.2f}{new:>18.2f}{new - old:>16.2f}')
+    print('\nФонд оплаты труда по должностям:')
+    for position in sorted(set(positions_before) | set(aggregate.by_position)):
+        old = positions_before[position].wage_fund if position in positions_before else 0
+        new = aggregate.by_position[position].wage_fund if position in aggregate.by_position else 0
+        if old != new:
+            print(f'{position}: {old} -> {new}')
+    if args.verify:
+        if not aggregate.verify():
+            raise SystemExit('Итоги сценария не совпали с полным пересчётом')
+        print('\nИтоги совпадают с полным пересчётом')
+
+
+def cmd_db(args: Namespace):
+    with open_store(args.database) as store:
+        # Импорт и все шаги - одна транзакция: при ошибке база остаётся как была
+        with store.transaction():
+            if args.import_csv:
+                report = ParseReport()
+                with profiling.operation('db import') as operation:
+                    operation.rows = store.import_csv(args.import_csv, report)
+                if report:
+                    print(report, file=sys.stderr)
+            for method, method_args in steps(args):
+                with profiling.operation(f'db {method}'):
+                    getattr(store, method)(*method_args)
+            if args.taxes:
+                with profiling.operation('db taxes') as operation:
+                    operation.rows = store.store_taxes()
+        print(f'Сотрудников в базе: {len(store)}')
+        if args.positions:
+            for position, totals in store.totals_by_position().items():
+                print(f'{position}: сотрудников {totals.count}, оклады {totals.salary}, премии {totals.premium:.2f}, '
+                      f'фонд оплаты труда {totals.wage_fund}')
+        print(f'Годовой фонд оплаты труда: {store.wage_fund()}')
+        if args.taxes:
+            print(f'Сумма выплат с налогами за год: {store.taxes_total():.2f}')
+
+
+def cmd_projection(args: Namespace):
+    from projection import project
+    table = load(args)
+    with profiling.operation('projection', len(table) * args.years):
+        projection = project(table, args.years, args.as_of)
+    if args.output:
+        writers.write_json_array((year.to_dict() for year in projection), args.output, output_mode(args))
+        return
+    print(f'{"Год":<6}{"Фонд оплаты труда":>20}{"Премии":>16}{"НДФЛ":>18}{"ФСС":>18}{"С налогами":>20}')
+    for year in projection:
+        print(f'{year.year:<6}{year.wage_fund:>20}{year.premium:>16.2f}{year.ndfl:>18.2f}{year.fss:>18.2f}'
+              f'{year.total:>20.2f}')
+    if args.positions:
+        print('\nФонд оплаты труда по должностям:')
+        for position, wage_funds in projection.by_position().items():
+            print(f'{position}: {", ".join(str(value) for value in wage_funds)}')
+
+
+def cmd_diagram(args: Namespace):
+    from charts import ChartSpec, SalaryChartRenderer, standard_charts
+    table = load(args)
+    with profiling.operation('diagram', len(table)):
+        renderer = SalaryChartRenderer(dpi=args.dpi)
+        if args.batch:
+            for path in renderer.render_batch(table, args.output, standard_charts(table, args.stat, args.as_of)):
+                print(path)
+        else:
+            title = 'Размер оклада по должностям' if args.by == 'position' else 'Размер оклада по полу'
+            renderer.render(table, args.output, ChartSpec('salary', title, group_by=args.by, stat=args.stat))
+
+
+def build_parser() -> ArgumentParser:
+    common = ArgumentParser(add_help=False)
+    common.add_argument('-i', '--input', default=CSV_FILE_PATH,
+                        help='CSV файл с сотрудниками, папка снимка или база SQLite')
+    common.add_argument('--premium', action='append', choices=PREMIUMS,
+                        help='начислить премию перед выполнением команды (можно указать несколько раз)')
+    common.add_argument('--index', action='store_true', help='проиндексировать зарплаты перед выполнением команды')
+    common.add_argument('--as-of', type=lambda value: Employee.parse_date(value).date(),
+                        help='дата расчёта стажа в формате ДД.ММ.ГГГГ, по умолчанию - сегодня')
+
+    output = ArgumentParser(add_help=False)
+    output.add_argument('--mode', default=writers.PRETTY, choices=writers.MODES, help='формат записи json')
+
+    pool = ArgumentParser(add_help=False)
+    pool.add_argument('--workers', type=int, help='обработать файл параллельно в указанном числе процессов')
+    pool.add_argument('--chunk-size', type=int, default=BATCH_SIZE, help='строк в одном чанке')
+
+    parser = ArgumentParser(description='Помощник начальника: пакетный режим')
+    parser.add_argument('--profile', action='store_true', help='замерить время, строки и скорость операций')
+    parser.add_argument('--profile-trace', metavar='PATH', help='вместе с --profile записать json трассу')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='вместе с --profile считать пиковую память операций (заметно медленнее)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('export', parents=[common, output, pool], help='записать сотрудников в json/csv')
+    command.add_argument('-o', '--output', required=True)
+    command.set_defaults(handler=cmd_export)
+
+    command = commands.add_parser('premiums', parents=[common, output], help='начислить премии')
+    command.add_argument('kinds', nargs='+', choices=PREMIUMS)
+    command.add_argument('-o', '--output')
+    command.set_defaults(handler=cmd_premiums)
+
+    command = commands.add_parser('index', parents=[common, output], help='индексация зарплат')
+    command.add_argument('-o', '--output')
+    command.set_defaults(handler=cmd_index)
+
+    command = commands.add_parser('vacation', parents=[common], help='сотрудники, которым положен отпуск')
+    command.add_argument('-o', '--output')
+    command.set_defaults(handler=cmd_vacation)
+
+    command = commands.add_parser('wage-fund', parents=[common], help='годовой фонд оплаты труда')
+    command.set_defaults(handler=cmd_wage_fund)
+
+    command = commands.add_parser('taxes', parents=[common, output, pool], help='налоговые отчисления')
+    command.add_argument('-o', '--output', help='json файл; без него отчёт выводится на экран')
+    command.add_argument('--name', help='ФИО сотрудника; по умолчанию - все сотрудники')
+    command.add_argument('--report', help='записать текстовый отчёт в файл вместо вывода на экран')
+    command.set_defaults(handler=cmd_taxes)
+
+    command = commands.add_parser('snapshot', parents=[common], help='сохранить данные в бинарный снимок')
+    command.add_argument('-o', '--output', required=True, help='папка снимка; её можно передавать в --input')
+    command.add_argument('--taxes', action='store_true', help='сохранить также налоговые отчисления')
+    command.set_defaults(handler=cmd_snapshot)
+
+    command = commands.add_parser('validate', parents=[common], help='проверить данные сотрудников')
+    command.add_argument('--chunk-size', type=int, default=BATCH_SIZE, help='строк в одном чанке')
+    command.set_defaults(handler=cmd_validate)
+
+    selection = ArgumentParser(add_help=False)
+    selection.add_argument('--name', action='append', help='ФИО сотрудника (можно указать несколько раз)')
+    selection.add_argument('--position', action='append', help='должность (можно указать несколько раз)')
+    selection.add_argument('--hired-since', type=Employee.parse_date, help='нанятые с этой даты (ДД.ММ.ГГГГ)')
+    selection.add_argument('--hired-before', type=Employee.parse_date, help='нанятые до этой даты (ДД.ММ.ГГГГ)')
+
+    command = commands.add_parser('employees', parents=[common, selection],
+                                  help='поиск сотрудников по ФИО, должности и дате найма')
+    command.set_defaults(handler=cmd_employees)
+
+    command = commands.add_parser('what-if', parents=[common, selection],
+                                  help='сценарий: как изменятся фонд оплаты труда и налоги после изменений')
+    command.add_argument('--do', action='append', choices=SCENARIO_ACTIONS,
+                         help='индексация или премия выбранным сотрудникам (можно указать несколько раз)')
+    command.add_argument('--set-salary', type=int, help='новый оклад выбранных сотрудников')
+    command.add_argument('--set-position', help='новая должность выбранных сотрудников')
+    command.add_argument('--verify', action='store_true', help='сверить итоги с полным пересчётом')
+    command.set_defaults(handler=cmd_what_if)
+
+    command = commands.add_parser('db', help='хранилище SQLite: импорт, премии и индексация с сохранением')
+    command.add_argument('database', help='файл базы SQLite; создаётся, если его нет')
+    command.add_argument('--import', dest='import_csv', metavar='CSV', help='загрузить или обновить сотрудников из CSV')
+    command.add_argument('--premium', action='append', choices=PREMIUMS, help='начислить премию и сохранить в базе')
+    command.add_argument('--index', action='store_true', help='проиндексировать зарплаты в базе')
+    command.add_argument('--as-of', type=lambda value: Employee.parse_date(value).date(),
+                         help='дата расчёта стажа в формате ДД.ММ.ГГГГ, по умолчанию - сегодня')
+    command.add_argument('--taxes', action='store_true', help='рассчитать и сохранить налоговые отчисления')
+    command.add_argument('--positions', action='store_true', help='вывести итоги по должностям')
+    command.set_defaults(handler=cmd_db)
+
+    command = commands.add_parser('projection', parents=[common, output],
+                                  help='прогноз фонда оплаты труда и налогов на несколько лет')
+    command.add_argument('--years', type=int, default=10, help='количество лет, включая текущий')
+    command.add_argument('--positions', action='store_true', help='вывести фонд оплаты труда по должностям')
+    command.add_argument('-o', '--output', help='json файл; без него таблица выводится на экран')
+    command.set_defaults(handler=cmd_projection)
+
+    command = commands.add_parser('diagram', parents=[common], help='диаграмма окладов по должностям')
+    command.add_argument('-o', '--output', required=True, help='png файл, а с --batch - папка для диаграмм')
+    command.add_argument('--stat', default='mean', choices=('mean', 'median', 'min', 'max', 'count'))
+    command.add_argument('--by', default='position', choices=('position', 'sex'))
+    command.add_argument('--dpi', type=int, default=150)
+    command.add_argument('--batch', action='store_true',
+                         help='набор диаграмм: по должностям, программистам, полу и после индексации')
+    command.set_defaults(handler=cmd_diagram)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    if args.profile or args.profile_trace:
+        profiling.enable(args.profile_trace, memory=args.profile_memory)
+    else:
+        profiling.enable_from_env()
+    try:
+        args.handler(args)
+    finally:
+        profiling.finish()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from Employee import Employee
+
+
+class EmployeeIndex:
+    # Индексы по ФИО, должности и дате найма; обновляются сами при изменении сотрудника
+    def __init__(self, employees: Iterable[Employee] = ()):
+        self.by_name: Dict[str, List[Employee]] = {}
+        self.by_position: Dict[str, List[Employee]] = {}
+        self.programmers: Dict[Employee, None] = {}
+        self._hire_dates: List[Tuple[datetime, int]] = []
+        self._by_id: Dict[int, Employee] = {}
+        self._keys: Dict[Employee, tuple] = {}
+        for employee in employees:
+            if employee not in self._keys:
+                self._insert(employee, keep_sorted=False)
+                employee.subscribe(self)
+        self._hire_dates.sort()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, employee: Employee) -> bool:
+        return employee in self._keys
+
+    def add(self, employee: Employee):
+        if employee in self._keys:
+            return
+        self._insert(employee)
+        employee.subscribe(self)
+
+    def remove(self, employee: Employee):
+        self._delete(employee)
+        employee.unsubscribe(self)
+
+    def employee_changed(self, employee: Employee):
+        if self._keys[employee] != self._key(employee):
+            self._delete(employee)
+            self._insert(employee)
+
+    def employees(self) -> List[Employee]:
+        return list(self._keys)
+
+    def find(self, full_name: str) -> List[Employee]:
+        return list(self.by_name.get(full_name, ()))
+
+    def with_position(self, position: str) -> List[Employee]:
+        return list(self.by_position.get(position, ()))
+
+    def hired_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Employee]:
+        # Полуинтервал [start, end)
+        low = 0 if start is None else bisect_left(self._hire_dates, (start, -1))
+        high = len(self._hire_dates) if end is None else bisect_left(self._hire_dates, (end, -1))
+        return [self._by_id[key] for _, key in self._hire_dates[low:high]]
+
+    def hired_before(self, date: datetime) -> List[Employee]:
+        return self.hired_between(end=date)
+
+    def hired_since(self, date: datetime) -> List[Employee]:
+        return self.hired_between(start=date)
+
+    def prem_prog(self):
+        # Премия ко дню программиста без просмотра всего штата
+        for employee in list(self.programmers):
+            employee.prem_prog()
+
+    @staticmethod
+    def _key(employee: Employee) -> tuple:
+        return employee.full_name, employee.position, employee.hire_date, employee.is_programmer
+
+    def _insert(self, employee: Employee, keep_sorted: bool = True):
+        key = self._keys[employee] = self._key(employee)
+        full_name, position, hire_date, programmer = key
+        self.by_name.setdefault(full_name, []).append(employee)
+        self.by_position.setdefault(position, []).append(employee)
+        if programmer:
+            self.programmers[employee] = None
+        self._by_id[id(employee)] = employee
+        if keep_sorted:
+            insort(self._hire_dates, (hire_date, id(employee)))
+        else:
+            self._hire_dates.append((hire_date, id(employee)))
+
+    def _delete(self, employee: Employee):
+        full_name, position, hire_date, programmer = self._keys.pop(employee)
+        for groups, group_key in ((self.by_name, full_name), (self.by_position, position)):
+            group = groups[group_key]
+            group.remove(employee)
+            if not group:
+                del groups[group_key]
+        self.programmers.pop(employee, None)
+        del self._by_id[id(employee)]
+        position_in_dates = bisect_left(self._hire_dates, (hire_date, id(employee)))
+        del self._hire_dates[position_in_dates]
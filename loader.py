@@ -0,0 +1,182 @@
+from functools import lru_cache
+from itertools import islice
+from string import capwords
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from Employee import Employee
+from EmployeeTable import EmployeeTable
+from tenure import EPOCH_ORDINAL
+import csv, numpy
+
+BATCH_SIZE = 10000
+# Разделители разрядов, которые встречаются в выгрузках: "250 000"
+THOUSANDS_SEPARATORS = str.maketrans('', '', ' \xa0\u202f')
+
+
+class RowError(NamedTuple):
+    line: int
+    row: List[str]
+    message: str
+
+
+class ParseReport:
+    def __init__(self, max_errors: Optional[int] = 1000):
+        self.max_errors = max_errors
+        self.errors: List[RowError] = []
+        self.rows_ok = 0
+        self.rows_failed = 0
+
+    def add(self, error: RowError):
+        self.rows_failed += 1
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append(error)
+
+    def __bool__(self) -> bool:
+        return self.rows_failed > 0
+
+    def __str__(self) -> str:
+        lines = [f'Обработано строк: {self.rows_ok}, пропущено с ошибками: {self.rows_failed}']
+        for error in self.errors:
+            lines.append(f'    строка {error.line}: {error.message} ({";".join(error.row)})')
+        if self.rows_failed > len(self.errors):
+            lines.append(f'    ... и ещё {self.rows_failed - len(self.errors)}')
+        return '\n'.join(lines)
+
+
+# В выгрузке даты найма сильно повторяются, strptime на каждую строку не нужен
+parse_date = lru_cache(maxsize=65536)(Employee.parse_date)
+
+
+def parse_salary(value: str) -> int:
+    return int(value.translate(THOUSANDS_SEPARATORS))
+
+
+def parse_row(row: List[str]) -> tuple:
+    if len(row) < 5:
+        raise ValueError('недостаточно столбцов')
+    name_parts = row[0].split()
+    if len(name_parts) < 2:
+        raise ValueError('в ФИО должны быть хотя бы фамилия и имя')
+    try:
+        hire_date = parse_date(row[2].strip())
+    except ValueError:
+        raise ValueError(f'неверная дата найма "{row[2]}"') from None
+    try:
+        salary = parse_salary(row[3])
+    except ValueError:
+        raise ValueError(f'неверный оклад "{row[3]}"') from None
+    return (name_parts[0], name_parts[1], name_parts[2] if len(name_parts) > 2 else None,
+            row[1], hire_date, salary, capwords(row[4].strip()))
+
+
+def iter_numbered_rows(file_path: str) -> Iterator[Tuple[int, List[str]]]:
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as csvfile:
+        reader = csv.reader(csvfile, delimiter=';')
+        next(reader, None)
+        for row in reader:
+            if row:
+                yield reader.line_num, row
+
+
+def iter_raw_batches(file_path: str, batch_size: int = BATCH_SIZE) -> Iterator[List[Tuple[int, List[str]]]]:
+    # Строки без разбора - для раздачи по процессам
+    batch = []
+    for numbered_row in iter_numbered_rows(file_path):
+        batch.append(numbered_row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_rows(numbered_rows: Iterable[Tuple[int, List[str]]],
+               report: Optional[ParseReport] = None) -> Iterator[tuple]:
+    for _, fields in parse_numbered_rows(numbered_rows, report):
+        yield fields
+
+
+def parse_numbered_rows(numbered_rows: Iterable[Tuple[int, List[str]]],
+                        report: Optional[ParseReport] = None) -> Iterator[Tuple[int, tuple]]:
+    # Как parse_rows, но вместе с номером строки файла
+    for line, row in numbered_rows:
+        try:
+            fields = parse_row(row)
+        except ValueError as error:
+            if report is None:
+                raise ValueError(f'Строка {line}: {error}') from None
+            report.add(RowError(line, row, str(error)))
+            continue
+        if report is not None:
+            report.rows_ok += 1
+        yield line, fields
+
+
+def iter_rows(file_path: str, report: Optional[ParseReport] = None) -> Iterator[tuple]:
+    return parse_rows(iter_numbered_rows(file_path), report)
+
+
+def iter_employees(file_path: str, report: Optional[ParseReport] = None) -> Iterator[Employee]:
+    for last_name, first_name, middle_name, position, hire_date, salary, sex in iter_rows(file_path, report):
+        yield Employee(
+            last_name=last_name,
+            first_name=first_name,
+            middle_name=middle_name,
+            position=position,
+            hire_date=hire_date,
+            salary=salary,
+            sex=sex
+        )
+
+
+def iter_numbered_batches(file_path: str, batch_size: int = BATCH_SIZE,
+                          report: Optional[ParseReport] = None) -> Iterator[Tuple[List[int], List[tuple]]]:
+    # Разобранные строки чанками и номера строк файла для них - для проверки исходных значений
+    lines, batch = [], []
+    for line, fields in parse_numbered_rows(iter_numbered_rows(file_path), report):
+        lines.append(line)
+        batch.append(fields)
+        if len(batch) >= batch_size:
+            yield lines, batch
+            lines, batch = [], []
+    if batch:
+        yield lines, batch
+
+
+def table_from_rows(rows: List[tuple]) -> EmployeeTable:
+    last_names, first_names, middle_names, positions, hire_dates, salary, sex = zip(*rows) if rows else ([],) * 7
+    return EmployeeTable(
+        last_names=last_names,
+        first_names=first_names,
+        middle_names=middle_names,
+        positions=positions,
+        hire_dates=[value.date() for value in hire_dates],
+        salary=salary,
+        sex=sex
+    )
+
+
+def load_table(file_path: str, report: Optional[ParseReport] = None, batch_size: int = BATCH_SIZE) -> EmployeeTable:
+    # Столбцы собираются прямо из разобранных строк чанками: ни объектов Employee, ни списка всех строк
+    names = ([], [], [], [])
+    hire_dates, salary, sex = [], [], []
+    rows = iter_rows(file_path, report)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        last_names, first_names, middle_names, positions, batch_dates, batch_salary, batch_sex = zip(*batch)
+        for column, values in zip(names, (last_names, first_names, middle_names, positions)):
+            column.extend(values)
+        hire_dates.append(numpy.array([value.toordinal() for value in batch_dates], dtype=numpy.int64))
+        salary.append(numpy.array(batch_salary, dtype=numpy.int64))
+        sex.extend(batch_sex)
+    return EmployeeTable(
+        last_names=names[0],
+        first_names=names[1],
+        middle_names=names[2],
+        positions=names[3],
+        hire_dates=(numpy.concatenate(hire_dates or [numpy.zeros(0, numpy.int64)]) - EPOCH_ORDINAL).astype(
+            'datetime64[D]'),
+        salary=numpy.concatenate(salary or [numpy.zeros(0, numpy.int64)]),
+        sex=sex
+    )
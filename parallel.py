@@ -0,0 +1,125 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+from Employee import Employee
+from loader import BATCH_SIZE, ParseReport, iter_raw_batches, parse_rows, table_from_rows
+import csv, os, shutil, tempfile, writers
+
+EXPORT = 'export'
+TAXES = 'taxes'
+
+
+def _process_shard(job: str, rows: List[Tuple[int, List[str]]], part_path: str, file_format: str,
+                   mode: str, steps: Sequence[tuple]) -> Tuple[int, ParseReport, Optional[List[Tuple[str, int]]]]:
+    report = ParseReport()
+    table = table_from_rows(list(parse_rows(rows, report)))
+    for method, method_args in steps:
+        getattr(table, method)(*method_args)
+    if file_format == 'csv':
+        count = writers.write_csv_rows((list(emp.to_dict().values()) for emp in table), part_path)
+        return count, report, None
+    if job == TAXES:
+        # Однофамильцы могут оказаться в разных чанках, поэтому пары пишутся без разделителей,
+        # а выбирает и склеивает их merge(); в ответ - ФИО и длина каждой пары в байтах
+        entries = []
+        with open(part_path, 'wb', buffering=writers.BUFFER_SIZE) as file:
+            for name, taxes in table.taxes().items(table.full_names):
+                data = writers.object_entry(name, taxes, mode).encode('utf-8')
+                file.write(data)
+                entries.append((name, len(data)))
+        return len(entries), report, entries
+    with writers.open_output(part_path) as file:
+        # Фрагмент без открывающей и закрывающей скобки, склеивается в merge()
+        writer = writers.JsonArrayWriter(file, mode)
+        for emp in table:
+            writer.write(emp.to_dict())
+    return writer.count, report, None
+
+
+def merge(job: str, parts: List[Tuple[str, int, Optional[list]]], output: str, file_format: str, mode: str) -> int:
+    if file_format == 'csv':
+        with open(output, mode='w', newline='', encoding='utf-8', buffering=writers.BUFFER_SIZE) as file:
+            csv.writer(file, delimiter=';').writerow(Employee.FIELDS)
+            for path, _, _ in parts:
+                with open(path, newline='', encoding='utf-8') as part:
+                    shutil.copyfileobj(part, file, writers.BUFFER_SIZE)
+        return sum(count for _, count, _ in parts)
+    if job == TAXES:
+        return _merge_taxes(parts, output, mode)
+    with writers.open_output(output) as file, writers.JsonArrayWriter(file, mode) as writer:
+        for path, count, _ in parts:
+            writer.append_fragment(path, count)
+    return writer.count
+
+
+def _merge_taxes(parts: List[Tuple[str, int, list]], output: str, mode: str) -> int:
+    # Как у словаря {ФИО: отчисления} в последовательном расчёте: у однофамильцев остаётся
+    # пара последнего, на месте первого
+    last = {}
+    for number, (_, _, entries) in enumerate(parts):
+        offset = 0
+        for name, length in entries:
+            last[name] = (number, offset, length)
+            offset += length
+    part, part_number = None, None
+    try:
+        with writers.open_output(output) as file, writers.JsonObjectWriter(file, mode) as writer:
+            for number, offset, length in last.values():
+                # Без однофамильцев чанки читаются подряд; файл открыт всегда только один
+                if number != part_number:
+                    if part is not None:
+                        part.close()
+                    part, part_number = open(parts[number][0], 'rb', buffering=writers.BUFFER_SIZE), number
+                if part.tell() != offset:
+                    part.seek(offset)
+                writer.write_entry(part.read(length).decode('utf-8'))
+    finally:
+        if part is not None:
+            part.close()
+    return writer.count
+
+
+def _check_csv(input_path: str):
+    # Делить на чанки можно только текстовый CSV: папка снимка или база SQLite сюда попадать не должны
+    if not os.path.isfile(input_path):
+        raise ValueError(f'{input_path} не является CSV файлом')
+    with open(input_path, 'rb') as file:
+        if b'\x00' in file.read(4096):
+            raise ValueError(f'{input_path} не является CSV файлом')
+
+
+def run(job: str, input_path: str, output: str, workers: Optional[int] = None, chunk_size: int = BATCH_SIZE,
+        mode: str = writers.PRETTY, steps: Sequence[tuple] = (), report: Optional[ParseReport] = None) -> int:
+    if job not in (EXPORT, TAXES):
+        raise ValueError(f'Неизвестная задача: {job}')
+    file_format = 'csv' if output.endswith('.csv') else 'json'
+    if file_format == 'csv' and job == TAXES:
+        raise ValueError('Налоговые отчисления сохраняются только в json')
+    _check_csv(input_path)
+    workers = workers or os.cpu_count() or 1
+    part_dir = tempfile.mkdtemp(prefix='payroll-', dir=os.path.dirname(os.path.abspath(output)))
+    try:
+        parts = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for number, rows in enumerate(iter_raw_batches(input_path, chunk_size)):
+                part_path = os.path.join(part_dir, f'part-{number:06d}')
+                pending.append((part_path, pool.submit(_process_shard, job, rows, part_path,
+                                                       file_format, mode, tuple(steps))))
+                # Не держим в памяти больше чанков, чем успевают обработать процессы
+                if len(pending) >= workers * 2:
+                    parts.append(_collect(*pending.pop(0), report))
+            for part_path, future in pending:
+                parts.append(_collect(part_path, future, report))
+        return merge(job, parts, output, file_format, mode)
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+
+def _collect(part_path: str, future, report: Optional[ParseReport]) -> Tuple[str, int, Optional[list]]:
+    count, shard_report, entries = future.result()
+    if report is not None:
+        report.rows_ok += shard_report.rows_ok
+        for error in shard_report.errors:
+            report.add(error)
+        report.rows_failed += shard_report.rows_failed - len(shard_report.errors)
+    return part_path, count, entries
@@ -0,0 +1,231 @@
+from datetime import datetime
+from functools import wraps
+from time import perf_counter
+from typing import Dict, List, Optional, TextIO
+import inspect, json, os, sys, tracemalloc
+
+# Значение - путь к json трассе; "1" - только сводка на экране
+PROFILE_ENV = 'PAYROLL_PROFILE'
+# Непустое значение - дополнительно считать выделения памяти через tracemalloc (заметно медленнее)
+PROFILE_MEMORY_ENV = 'PAYROLL_PROFILE_MEMORY'
+EMPLOYEE_METHODS = ('prem_prog', 'prem_wom', 'prem_man', 'index', 'rest', 'annual_wage', 'taxes_counter',
+                    'write_to_json', 'write_to_csv', 'wage_fund', 'save_diagram')
+
+
+class Operation:
+    __slots__ = ('name', 'rows', 'depth', 'start', 'seconds', 'peak_bytes', '_profiler', '_memory_start')
+
+    def __init__(self, profiler: 'Profiler', name: str, rows: Optional[int] = None):
+        self._profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.depth = 0
+        self.start = self.seconds = 0.0
+        self.peak_bytes: Optional[int] = None
+
+    def __enter__(self) -> 'Operation':
+        self._profiler._enter(self)
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self._profiler._exit(self)
+        return False
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'depth': self.depth, 'start': self.start, 'seconds': self.seconds,
+                'rows': self.rows, 'peak_bytes': self.peak_bytes}
+
+
+class _Disabled:
+    # Общий пустой контекст: при выключенном профилировании ничего не замеряется
+    rows = None
+
+    def __enter__(self) -> '_Disabled':
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+class Profiler:
+    def __init__(self, trace_path: Optional[str] = None, memory: bool = False):
+        self.trace_path = trace_path
+        self.memory = memory
+        self.operations: List[Operation] = []
+        # Методы Employee вызываются на каждого сотрудника - по ним копятся только счётчики: [вызовы, секунды, строки]
+        self.calls: Dict[str, list] = {}
+        self._stack: List[Operation] = []
+        self._peaks: List[int] = []
+        self._origin = perf_counter()
+        self._started = datetime.now()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def operation(self, name: str, rows: Optional[int] = None) -> Operation:
+        return Operation(self, name, rows)
+
+    def _enter(self, operation: Operation):
+        operation.depth = len(self._stack)
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                # Пик внешней операции сохраняем до сброса счётчика для вложенной
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            operation._memory_start = current
+            self._peaks.append(current)
+        self._stack.append(operation)
+        operation.start = perf_counter() - self._origin
+
+    def _exit(self, operation: Operation):
+        operation.seconds = perf_counter() - self._origin - operation.start
+        self._stack.pop()
+        if self.memory:
+            peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            operation.peak_bytes = peak - operation._memory_start
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+        self.operations.append(operation)
+
+    def count_call(self, name: str, seconds: float, rows: Optional[int] = None):
+        counter = self.calls.get(name)
+        if counter is None:
+            counter = self.calls[name] = [0, 0.0, None]
+        counter[0] += 1
+        counter[1] += seconds
+        if rows is not None:
+            counter[2] = (counter[2] or 0) + rows
+
+    def summary(self) -> List[dict]:
+        totals: Dict[str, dict] = {}
+        for operation in self.operations:
+            total = totals.setdefault(operation.name, {'operation': operation.name, 'calls': 0, 'rows': None,
+                                                       'seconds': 0.0, 'peak_bytes': None})
+            total['calls'] += 1
+            total['seconds'] += operation.seconds
+            if operation.rows is not None:
+                total['rows'] = (total['rows'] or 0) + operation.rows
+            if operation.peak_bytes is not None:
+                total['peak_bytes'] = max(total['peak_bytes'] or 0, operation.peak_bytes)
+        for name, (calls, seconds, rows) in self.calls.items():
+            totals[name] = {'operation': name, 'calls': calls, 'rows': rows, 'seconds': seconds, 'peak_bytes': None}
+        for total in totals.values():
+            total['rows_per_second'] = total['rows'] / total['seconds'] if total['rows'] and total['seconds'] else None
+        return list(totals.values())
+
+    def tax_cache_stats(self) -> Optional[dict]:
+        # Импорт здесь: профилировщик не должен сам создавать кэш или тянуть за собой модели
+        import tax_cache
+        return tax_cache.default_stats()
+
+    def format_summary(self) -> str:
+        lines = [f'{"Операция":<32}{"вызовы":>9}{"строки":>11}{"время, с":>11}{"строк/с":>13}{"пик, МБ":>10}']
+        for total in self.summary():
+            rows = f'{total["rows"]:>11}' if total['rows'] is not None else f'{"-":>11}'
+            speed = f'{total["rows_per_second"]:>13.0f}' if total['rows_per_second'] else f'{"-":>13}'
+            peak = f'{total["peak_bytes"] / 2 ** 20:>10.1f}' if total['peak_bytes'] is not None else f'{"-":>10}'
+            lines.append(f'{total["operation"]:<32}{total["calls"]:>9}{rows}{total["seconds"]:>11.3f}{speed}{peak}')
+        stats = self.tax_cache_stats()
+        if stats and stats['hits'] + stats['misses']:
+            lines.append(f'Кэш налогов: попаданий {stats["hits"]}, промахов {stats["misses"]} '
+                         f'({stats["hit_rate"]:.1%} попаданий), записей {stats["size"]} из {stats["maxsize"]}')
+        return '\n'.join(lines)
+
+    def trace(self) -> dict:
+        return {
+            'started': self._started.isoformat(timespec='seconds'),
+            'argv': sys.argv,
+            'memory': self.memory,
+            'operations': [operation.to_dict() for operation in sorted(self.operations, key=lambda op: op.start)],
+            'summary': self.summary(),
+            'tax_cache': self.tax_cache_stats(),
+        }
+
+    def save(self, path: Optional[str] = None):
+        with open(path or self.trace_path, 'w', encoding='utf-8') as file:
+            json.dump(self.trace(), file, ensure_ascii=False, indent=4)
+
+    def finish(self, file: TextIO = sys.stderr):
+        if self.memory:
+            tracemalloc.stop()
+        print(self.format_summary(), file=file)
+        if self.trace_path:
+            self.save()
+            print(f'Трасса записана в {self.trace_path}', file=file)
+
+
+_profiler: Optional[Profiler] = None
+_DISABLED = _Disabled()
+_originals: Dict[str, object] = {}
+
+
+def enabled() -> bool:
+    return _profiler is not None
+
+
+def current() -> Optional[Profiler]:
+    return _profiler
+
+
+def operation(name: str, rows: Optional[int] = None):
+    if _profiler is None:
+        return _DISABLED
+    return _profiler.operation(name, rows)
+
+
+def _timed(name: str, func, rows: Optional[int]):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if _profiler is not None:
+                _profiler.count_call(name, perf_counter() - start, rows)
+    return wrapper
+
+
+def _instrument_employee():
+    # Обёртки ставятся только при включении: без профилирования класс остаётся нетронутым
+    from Employee import Employee
+    for name in EMPLOYEE_METHODS:
+        if name in _originals:
+            continue
+        original = inspect.getattr_static(Employee, name)
+        _originals[name] = original
+        if isinstance(original, staticmethod):
+            # Статические методы работают со всем списком сотрудников - строки по ним не считаются
+            setattr(Employee, name, staticmethod(_timed(f'Employee.{name}', original.__func__, None)))
+        else:
+            setattr(Employee, name, _timed(f'Employee.{name}', original, 1))
+
+
+def _restore_employee():
+    from Employee import Employee
+    for name, original in _originals.items():
+        setattr(Employee, name, original)
+    _originals.clear()
+
+
+def enable(trace_path: Optional[str] = None, memory: bool = False) -> Profiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(trace_path, memory)
+        _instrument_employee()
+    return _profiler
+
+
+def enable_from_env() -> Optional[Profiler]:
+    value = os.environ.get(PROFILE_ENV)
+    if not value or value == '0':
+        return None
+    return enable(None if value == '1' else value, memory=bool(os.environ.get(PROFILE_MEMORY_ENV)))
+
+
+def finish(file: TextIO = sys.stderr):
+    global _profiler
+    if _profiler is None:
+        return
+    profiler, _profiler = _profiler, None
+    _restore_employee()
+    profiler.finish(file)
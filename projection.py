@@ -0,0 +1,120 @@
+from datetime import date
+from typing import Dict, Iterator, List, NamedTuple, Optional
+from EmployeeTable import EmployeeTable
+from taxes import compute_taxes, tax_input_keys
+from tenure import INDEX_RATE, SENIOR_INDEX_RATE, SENIOR_MONTHS, months_of_service
+import numpy
+
+DEFAULT_YEARS = 10
+
+
+class ProjectionYear(NamedTuple):
+    year: int
+    as_of: date
+    employees: int
+    salary: int
+    wage_fund: int
+    premium: float
+    ndfl: float
+    fss: float
+    total: float
+
+    def to_dict(self) -> dict:
+        return {
+            'Год': self.year,
+            'Дата расчёта': self.as_of.strftime('%d.%m.%Y'),
+            'Сотрудников': self.employees,
+            'Оклады за месяц': self.salary,
+            'Фонд оплаты труда': self.wage_fund,
+            'Премии': round(self.premium, 2),
+            'НДФЛ': round(self.ndfl, 2),
+            'ФСС': round(self.fss, 2),
+            'Сумма выплат с налогами': round(self.total, 2),
+        }
+
+
+def add_years(value: date, years: int) -> date:
+    # 29 февраля в невисокосный год превращается в 28-е
+    try:
+        return value.replace(year=value.year + years)
+    except ValueError:
+        return value.replace(year=value.year + years, day=28)
+
+
+class Projection:
+    def __init__(self, dates: List[date], employees: int, salary: numpy.ndarray, wage_fund: numpy.ndarray,
+                 premium: numpy.ndarray, ndfl: numpy.ndarray, fss: numpy.ndarray, total: numpy.ndarray,
+                 positions: List[str], wage_fund_by_position: numpy.ndarray):
+        # Все массивы - по годам; wage_fund_by_position - (годы, должности)
+        self.dates = dates
+        self.employees = employees
+        self.salary = salary
+        self.wage_fund = wage_fund
+        self.premium = premium
+        self.ndfl = ndfl
+        self.fss = fss
+        self.total = total
+        self.positions = positions
+        self.wage_fund_by_position = wage_fund_by_position
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __iter__(self) -> Iterator[ProjectionYear]:
+        for i, as_of in enumerate(self.dates):
+            yield ProjectionYear(as_of.year, as_of, self.employees, int(self.salary[i]), int(self.wage_fund[i]),
+                                 float(self.premium[i]), float(self.ndfl[i]), float(self.fss[i]),
+                                 float(self.total[i]))
+
+    def by_position(self) -> Dict[str, List[int]]:
+        return {position: self.wage_fund_by_position[:, code].tolist()
+                for code, position in enumerate(self.positions)}
+
+
+def project_salaries(table: EmployeeTable, dates: List[date]) -> numpy.ndarray:
+    # Первый год - текущие оклады, в начале каждого следующего - индексация по стажу на эту дату,
+    # как последовательные вызовы EmployeeTable.index(as_of)
+    salary = numpy.empty((len(dates), len(table)), dtype=numpy.int64)
+    salary[0] = table.salary
+    for year in range(1, len(dates)):
+        rate = numpy.where(months_of_service(table.hire_date, dates[year]) >= SENIOR_MONTHS,
+                           SENIOR_INDEX_RATE, INDEX_RATE)
+        salary[year] = numpy.rint(salary[year - 1] * rate)
+    return salary
+
+
+def project(table: EmployeeTable, years: int = DEFAULT_YEARS, as_of: Optional[date] = None) -> Projection:
+    # Таблица не меняется: все годы считаются на копиях окладов
+    if years < 1:
+        raise ValueError('Количество лет прогноза должно быть положительным')
+    as_of = as_of or date.today()
+    dates = [add_years(as_of, year) for year in range(years)]
+    salary = project_salaries(table, dates)
+    programmer = table.programmer
+    size = len(table)
+
+    prog_premium = numpy.where(programmer, numpy.rint(0.03 * salary), 0).astype(numpy.int64)
+    annual_wage = salary * 12 + prog_premium + 2000
+    positions_count = len(table.positions)
+    wage_fund_by_position = numpy.zeros((years, positions_count), dtype=numpy.int64)
+    for year in range(years):
+        wage_fund_by_position[year] = numpy.bincount(table.position_code, weights=annual_wage[year],
+                                                     minlength=positions_count).round().astype(numpy.int64)
+
+    # Налоги зависят только от (оклад, пол, программист), а за годы оклады сильно повторяются:
+    # каждое сочетание по всем годам считается один раз, затем суммы раскладываются по годам
+    keys = tax_input_keys(salary, table.sex, programmer).reshape(-1)
+    if size:
+        _, first, inverse = numpy.unique(keys, return_index=True, return_inverse=True)
+        rows = first % size
+        taxes = compute_taxes(salary.reshape(-1)[first], table.sex[rows], programmer[rows], unique_inputs=False)
+        inverse = inverse.reshape(years, size)
+        premium = taxes.premium.sum(axis=1)[inverse].sum(axis=1)
+        ndfl = taxes.ndfl.sum(axis=1)[inverse].sum(axis=1)
+        fss = taxes.fss.sum(axis=1)[inverse].sum(axis=1)
+        total = taxes.total[inverse].sum(axis=1)
+    else:
+        premium = ndfl = fss = total = numpy.zeros(years)
+
+    return Projection(dates, size, salary.sum(axis=1), annual_wage.sum(axis=1), premium, ndfl, fss, total,
+                      list(table.positions), wage_fund_by_position)
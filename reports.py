@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from io import StringIO
+from typing import Iterable, Iterator, Optional, Sequence, TextIO
+from taxes import TaxTable
+from writers import open_output
+import sys
+
+MONTHS = ("январь", "февраль", "март", "апрель", "май", "июнь",
+          "июль", "август", "сентябрь", "октябрь", "ноябрь", "декабрь", "итого")
+# Шаблоны собираются один раз: названия месяцев уже подставлены, остаётся вставить суммы
+MONTH_TEMPLATES = tuple(f'''Данные на {month}:
+    Оклад: {{}}
+    Премия: {{}}
+    Налоги
+        НДФЛ: {{}}
+        ФСС: {{}}
+    Итоговая сумма на выплату работодателем за месяц: {{}}
+''' for month in MONTHS[:12])
+TOTAL_TEMPLATE = '-' * 40 + '\nСумма всех выплат за год: {}\n'
+HEADER_TEMPLATE = 'Для сотрудника {}:\n'
+# Блок сотрудника целиком - как print(f'Для сотрудника ...') и print(tax_parser(...)) подряд
+EMPLOYEE_TEMPLATE = HEADER_TEMPLATE + ''.join(MONTH_TEMPLATES) + TOTAL_TEMPLATE + '\n'
+CHUNK_SIZE = 10000
+PROGRAMMER_PREMIUM_MONTH = 8
+
+
+class TaxReportWriter:
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.count = 0
+
+    def write_schedule(self, schedule: dict):
+        write = self.file.write
+        for month, details in schedule.items():
+            if month != 13:
+                taxes = details['taxes']
+                write(MONTH_TEMPLATES[month - 1].format(details['salary'], details['premium'], taxes['НДФЛ'],
+                                                        taxes['ФСС'], details['month_sum']))
+            else:
+                write(TOTAL_TEMPLATE.format(schedule[13]))
+
+    def write(self, name: str, schedule: dict):
+        self.file.write(HEADER_TEMPLATE.format(name))
+        self.write_schedule(schedule)
+        self.file.write('\n')
+        self.count += 1
+
+    def write_many(self, pairs: Iterable[tuple]):
+        for name, schedule in pairs:
+            self.write(name, schedule)
+
+    def write_table(self, taxes: TaxTable, names: Sequence[str], chunk_size: int = CHUNK_SIZE):
+        # Без промежуточных словарей: столбцы переводятся в списки кусками, а блок сотрудника - один format
+        write = self.file.write
+        for start in range(0, len(taxes), chunk_size):
+            stop = min(start + chunk_size, len(taxes))
+            rows = zip(names[start:stop], taxes.salary[start:stop].tolist(), taxes.premium[start:stop].tolist(),
+                       taxes.ndfl[start:stop].tolist(), taxes.fss[start:stop].tolist(),
+                       taxes.month_sum[start:stop].tolist(), taxes.total[start:stop].tolist(),
+                       taxes.programmer[start:stop].tolist())
+            for name, salary, premium, ndfl, fss, month_sum, total, programmer in rows:
+                values = [name]
+                for month in range(12):
+                    month_premium = premium[month]
+                    if not programmer or month != PROGRAMMER_PREMIUM_MONTH:
+                        month_premium = int(month_premium)
+                    values += (salary, month_premium, ndfl[month], fss[month], month_sum[month])
+                values.append(total)
+                write(EMPLOYEE_TEMPLATE.format(*values))
+            self.count += stop - start
+
+
+@contextmanager
+def open_report(output: Optional[str] = None) -> Iterator[TaxReportWriter]:
+    # Без пути отчёт идёт в stdout
+    if output is None:
+        yield TaxReportWriter(sys.stdout)
+        sys.stdout.flush()
+    else:
+        with open_output(output) as file:
+            yield TaxReportWriter(file)
+
+
+def write_report(pairs: Iterable[tuple], output: Optional[str] = None) -> int:
+    with open_report(output) as writer:
+        writer.write_many(pairs)
+    return writer.count
+
+
+def write_table_report(taxes: TaxTable, names: Sequence[str], output: Optional[str] = None) -> int:
+    with open_report(output) as writer:
+        writer.write_table(taxes, names)
+    return writer.count
+
+
+def render_schedule(schedule: dict) -> str:
+    buffer = StringIO()
+    TaxReportWriter(buffer).write_schedule(schedule)
+    return buffer.getvalue()
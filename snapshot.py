@@ -0,0 +1,169 @@
+from collections.abc import Sequence
+from typing import Dict, List, Optional
+from EmployeeTable import EmployeeTable
+from taxes import TaxTable
+import json, os, shutil, tempfile, numpy
+
+FORMAT = 'payroll-snapshot'
+VERSION = 1
+META_FILE = 'meta.json'
+STRINGS_FILE = 'strings.bin'
+TAX_COLUMNS = ('salary', 'premium', 'ndfl', 'fss', 'month_sum', 'total', 'programmer')
+NO_STRING = -1
+
+
+class StringTable:
+    # Все строки снимка одним блоком UTF-8 и смещения к ним; столбцы хранят только номера строк
+    def __init__(self, data: numpy.ndarray, offsets: numpy.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        if i == NO_STRING:
+            return None
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    @staticmethod
+    def build(columns: List[Sequence]) -> tuple:
+        ids: Dict[str, int] = {}
+        encoded = []
+        codes = []
+        for column in columns:
+            column_codes = numpy.empty(len(column), dtype=numpy.int32)
+            for row, value in enumerate(column):
+                if value is None:
+                    column_codes[row] = NO_STRING
+                    continue
+                code = ids.get(value)
+                if code is None:
+                    code = ids[value] = len(encoded)
+                    encoded.append(value.encode('utf-8'))
+                column_codes[row] = code
+            codes.append(column_codes)
+        offsets = numpy.zeros(len(encoded) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return numpy.frombuffer(b''.join(encoded), dtype=numpy.uint8), offsets, codes
+
+
+class StringColumn(Sequence):
+    # Строки декодируются только при обращении к ним
+    def __init__(self, strings: StringTable, codes: numpy.ndarray):
+        self.strings = strings
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.strings[code] for code in self.codes[i].tolist()]
+        return self.strings[int(self.codes[i])]
+
+
+def _save(directory: str, name: str, array: numpy.ndarray):
+    numpy.save(os.path.join(directory, name + '.npy'), numpy.ascontiguousarray(array), allow_pickle=False)
+
+
+def save_snapshot(table: EmployeeTable, directory: str, taxes: Optional[TaxTable] = None):
+    # Столбцы таблицы могут быть отображены из файлов этого же снимка, поэтому снимок пишется
+    # в соседнюю временную папку и подменяет старый только целиком
+    directory = os.path.abspath(directory)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    temp_directory = tempfile.mkdtemp(prefix='.' + os.path.basename(directory) + '.', dir=parent)
+    try:
+        os.chmod(temp_directory, 0o755)
+        _write_snapshot(table, temp_directory, taxes)
+        if os.path.exists(directory):
+            # Каталог нельзя заменить через os.replace, пока он не пуст: старый сначала отодвигаем.
+            # Отображённые в память файлы старого снимка остаются доступны до конца процесса
+            old_directory = tempfile.mkdtemp(prefix='.' + os.path.basename(directory) + '.old.', dir=parent)
+            os.replace(directory, os.path.join(old_directory, 'snapshot'))
+            os.replace(temp_directory, directory)
+            shutil.rmtree(old_directory, ignore_errors=True)
+        else:
+            os.replace(temp_directory, directory)
+    except BaseException:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        raise
+
+
+def _write_snapshot(table: EmployeeTable, directory: str, taxes: Optional[TaxTable] = None):
+    data, offsets, (last_names, first_names, middle_names, positions) = StringTable.build(
+        [table.last_names, table.first_names, table.middle_names, table.positions])
+    data.tofile(os.path.join(directory, STRINGS_FILE))
+    _save(directory, 'string_offsets', offsets)
+    for name, array in (('last_name', last_names), ('first_name', first_names), ('middle_name', middle_names),
+                        ('positions', positions), ('position_code', table.position_code),
+                        ('hire_date', table.hire_date), ('salary', table.salary), ('sex', table.sex),
+                        ('premium', table.premium), ('premium_float', table._premium_float)):
+        _save(directory, name, array)
+    if taxes is not None:
+        os.makedirs(os.path.join(directory, 'taxes'), exist_ok=True)
+        for name in TAX_COLUMNS:
+            _save(os.path.join(directory, 'taxes'), name, getattr(taxes, name))
+    with open(os.path.join(directory, META_FILE), 'w', encoding='utf-8') as file:
+        json.dump({'format': FORMAT, 'version': VERSION, 'rows': len(table), 'taxes': taxes is not None}, file)
+
+
+class Snapshot:
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, META_FILE), encoding='utf-8') as file:
+            self.meta = json.load(file)
+        if self.meta.get('format') != FORMAT or self.meta.get('version') != VERSION:
+            raise ValueError(f'{directory} не является снимком данных сотрудников')
+        self.directory = directory
+        self._columns: Dict[str, numpy.ndarray] = {}
+        self._strings: Optional[StringTable] = None
+
+    def __len__(self) -> int:
+        return self.meta['rows']
+
+    def column(self, name: str) -> numpy.ndarray:
+        # Файл отображается в память при первом обращении; 'c' - изменения остаются только в памяти процесса
+        if name not in self._columns:
+            self._columns[name] = numpy.load(os.path.join(self.directory, name + '.npy'), mmap_mode='c')
+        return self._columns[name]
+
+    @property
+    def strings(self) -> StringTable:
+        if self._strings is None:
+            data_path = os.path.join(self.directory, STRINGS_FILE)
+            data = (numpy.memmap(data_path, dtype=numpy.uint8, mode='r') if os.path.getsize(data_path)
+                    else numpy.zeros(0, dtype=numpy.uint8))
+            self._strings = StringTable(data, self.column('string_offsets'))
+        return self._strings
+
+    def string_column(self, name: str) -> StringColumn:
+        return StringColumn(self.strings, self.column(name))
+
+    def table(self) -> EmployeeTable:
+        table = EmployeeTable(
+            last_names=self.string_column('last_name'),
+            first_names=self.string_column('first_name'),
+            middle_names=self.string_column('middle_name'),
+            positions=list(self.string_column('positions')),
+            position_code=self.column('position_code'),
+            hire_dates=self.column('hire_date'),
+            salary=self.column('salary'),
+            sex=self.column('sex'),
+            premium=self.column('premium'),
+        )
+        table._premium_float = self.column('premium_float')
+        return table
+
+    def taxes(self) -> TaxTable:
+        if not self.meta['taxes']:
+            raise ValueError('В снимке нет налоговых отчислений')
+        return TaxTable(**{name: self.column(os.path.join('taxes', name)) for name in TAX_COLUMNS})
+
+
+def open_snapshot(directory: str) -> Snapshot:
+    return Snapshot(directory)
+
+
+def is_snapshot(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, META_FILE))
@@ -0,0 +1,311 @@
+from contextlib import contextmanager
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from Employee import Employee
+from EmployeeTable import EmployeeTable
+from aggregates import Totals
+from loader import BATCH_SIZE, ParseReport, RowError, iter_numbered_rows, parse_numbered_rows
+from tax_cache import schedule_from_json
+from taxes import compute_taxes
+from tenure import INDEX_RATE, REST_MONTHS, SENIOR_INDEX_RATE, SENIOR_MONTHS, months_between
+import json, sqlite3, numpy
+
+SQLITE_HEADER = b'SQLite format 3\x00'
+# Путь к базе, с которой работает меню app.py: премии и индексация сохраняются в ней сразу
+STORE_ENV = 'PAYROLL_DB'
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    middle_name TEXT,
+    position TEXT NOT NULL,
+    programmer INTEGER NOT NULL,
+    hire_date TEXT NOT NULL,
+    salary INTEGER NOT NULL,
+    sex TEXT NOT NULL,
+    premium REAL NOT NULL DEFAULT 0,
+    premium_float INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS employees_identity ON employees (full_name, position, hire_date);
+CREATE INDEX IF NOT EXISTS employees_position ON employees (position);
+CREATE TABLE IF NOT EXISTS tax_schedules (
+    salary INTEGER NOT NULL,
+    sex TEXT NOT NULL,
+    programmer INTEGER NOT NULL,
+    total REAL NOT NULL,
+    schedule TEXT NOT NULL,
+    PRIMARY KEY (salary, sex, programmer)
+) WITHOUT ROWID;
+'''
+# Номера строк текущего импорта - чтобы найти строки, слитые в одну запись.
+# Отдельные запросы, а не executescript: тот завершает открытую транзакцию
+IMPORT_LINES_SCHEMA = (
+    'CREATE TEMP TABLE IF NOT EXISTS import_lines (line INTEGER PRIMARY KEY, full_name TEXT NOT NULL, '
+    'position TEXT NOT NULL, hire_date TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS temp.import_lines_identity ON import_lines (full_name, position, hire_date)',
+    'DELETE FROM temp.import_lines',
+)
+# Сотрудник определяется ФИО, должностью и датой найма: повторный импорт обновляет оклад и пол, премии сохраняются
+UPSERT = '''
+INSERT INTO employees (full_name, last_name, first_name, middle_name, position, programmer, hire_date, salary, sex)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (full_name, position, hire_date) DO UPDATE SET salary = excluded.salary, sex = excluded.sex
+'''
+COLUMNS = 'last_name, first_name, middle_name, position, hire_date, salary, sex, premium, premium_float'
+# Тот же расчёт, что у Employee.annual_wage; py_round - round из Python, в SQLite округление другое
+ANNUAL_WAGE = 'salary * 12 + CASE WHEN programmer THEN py_round(0.03 * salary) ELSE 0 END + 2000'
+
+
+def _full_name(last_name: str, first_name: str, middle_name: Optional[str]) -> str:
+    return f'{last_name} {first_name}{(" " + middle_name) if middle_name else ""}'
+
+
+def _record(last_name: str, first_name: str, middle_name: Optional[str], position: str, hire_date: datetime,
+            salary: int, sex: str) -> tuple:
+    return (_full_name(last_name, first_name, middle_name), last_name, first_name, middle_name, position,
+            'программист' in position, hire_date.strftime('%Y-%m-%d'), salary, sex)
+
+
+def _parse_schedule(text: str) -> dict:
+    return schedule_from_json(json.loads(text))
+
+
+def is_database(path: str) -> bool:
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+class EmployeeStore:
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        # Транзакциями управляем сами: несколько операций можно объединить в одну через transaction()
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.create_function('py_round', 1, round, deterministic=True)
+        self.connection.executescript(SCHEMA)
+        self._depth = 0
+
+    def __enter__(self) -> 'EmployeeStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM employees').fetchone()[0]
+
+    @contextmanager
+    def transaction(self):
+        # Вложенные вызовы входят во внешнюю транзакцию; при ошибке откатывается всё целиком
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+        self.connection.execute('BEGIN IMMEDIATE')
+        self._depth = 1
+        try:
+            yield self
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        else:
+            self.connection.execute('COMMIT')
+        finally:
+            self._depth = 0
+
+    def _executemany(self, sql: str, records: Iterable[tuple], batch_size: int) -> int:
+        count = 0
+        records = iter(records)
+        with self.transaction():
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    return count
+                self.connection.executemany(sql, batch)
+                count += len(batch)
+
+    def import_csv(self, file_path: str, report: Optional[ParseReport] = None, batch_size: int = BATCH_SIZE) -> int:
+        # Строки одного файла с теми же ФИО, должностью и датой найма сливаются в одну запись - скорее всего,
+        # это разные люди, поэтому такие строки попадают в отчёт. Возвращается число записей, которые легли в базу
+        for statement in IMPORT_LINES_SCHEMA:
+            self.connection.execute(statement)
+        numbered_rows = parse_numbered_rows(iter_numbered_rows(file_path), report)
+        count = 0
+        with self.transaction():
+            while True:
+                batch = list(islice(numbered_rows, batch_size))
+                if not batch:
+                    break
+                records = [_record(*fields) for _, fields in batch]
+                self.connection.executemany(UPSERT, records)
+                self.connection.executemany(
+                    'INSERT INTO temp.import_lines VALUES (?, ?, ?, ?)',
+                    [(line, record[0], record[4], fields[4].strftime('%d.%m.%Y'))
+                     for (line, fields), record in zip(batch, records)])
+                count += len(batch)
+            merged = self.connection.execute(
+                'SELECT d.line, d.full_name, d.position, d.hire_date, MIN(f.line) FROM temp.import_lines d '
+                'JOIN temp.import_lines f ON f.full_name = d.full_name AND f.position = d.position '
+                'AND f.hire_date = d.hire_date AND f.line < d.line GROUP BY d.line ORDER BY d.line').fetchall()
+        self.connection.execute('DELETE FROM temp.import_lines')
+        if report is not None:
+            for line, full_name, position, hire_date, first_line in merged:
+                report.rows_ok -= 1
+                report.add(RowError(line, [full_name, position, hire_date],
+                                    f'те же ФИО, должность и дата найма, что в строке {first_line}: '
+                                    'строки объединены в одну запись'))
+        return count - len(merged)
+
+    def add_employees(self, employees: Iterable[Employee], batch_size: int = BATCH_SIZE) -> int:
+        records = (_record(emp.last_name, emp.first_name, emp.middle_name, emp.position, emp.hire_date,
+                           emp.salary, emp.sex) for emp in employees)
+        return self._executemany(UPSERT, records, batch_size)
+
+    def clear(self):
+        with self.transaction():
+            self.connection.execute('DELETE FROM employees')
+
+    def _employee(self, row: tuple) -> Employee:
+        last_name, first_name, middle_name, position, hire_date, salary, sex, premium, premium_float = row
+        return Employee(
+            last_name=last_name,
+            first_name=first_name,
+            middle_name=middle_name,
+            position=position,
+            hire_date=datetime.strptime(hire_date, '%Y-%m-%d'),
+            salary=salary,
+            sex=sex,
+            premium=premium if premium_float else int(premium),
+        )
+
+    def iter_employees(self, batch_size: int = BATCH_SIZE) -> Iterator[Employee]:
+        cursor = self.connection.execute(f'SELECT {COLUMNS} FROM employees ORDER BY id')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self._employee(row)
+
+    def find(self, full_name: str) -> List[Employee]:
+        rows = self.connection.execute(f'SELECT {COLUMNS} FROM employees WHERE full_name = ? ORDER BY id',
+                                       (full_name,))
+        return [self._employee(row) for row in rows]
+
+    def table(self) -> EmployeeTable:
+        rows = self.connection.execute(f'SELECT {COLUMNS} FROM employees ORDER BY id').fetchall()
+        last_names, first_names, middle_names, positions, hire_dates, salary, sex, premium, premium_float = (
+            zip(*rows) if rows else ([],) * 9)
+        table = EmployeeTable(
+            last_names=list(last_names),
+            first_names=list(first_names),
+            middle_names=list(middle_names),
+            positions=list(positions),
+            hire_dates=numpy.array(hire_dates, dtype='datetime64[D]'),
+            salary=numpy.array(salary, dtype=numpy.int64),
+            sex=numpy.array(sex, dtype=str),
+            premium=numpy.array(premium, dtype=numpy.float64),
+        )
+        table._premium_float = numpy.array(premium_float, dtype=bool)
+        return table
+
+    def prem_prog(self):
+        with self.transaction():
+            self.connection.execute('UPDATE employees SET premium = premium + salary * 0.03, premium_float = 1 '
+                                    'WHERE programmer')
+
+    def prem_wom(self):
+        with self.transaction():
+            self.connection.execute("UPDATE employees SET premium = premium + 2000 WHERE sex = 'Ж'")
+
+    def prem_man(self):
+        with self.transaction():
+            self.connection.execute("UPDATE employees SET premium = premium + 2000 WHERE sex = 'М'")
+
+    def _register_tenure(self, as_of: Optional[date]):
+        as_of = as_of or date.today()
+        self.connection.create_function(
+            'months_of_service', 1,
+            lambda hire_date: months_between(datetime.strptime(hire_date, '%Y-%m-%d').date(), as_of),
+            deterministic=True)
+
+    def index(self, as_of: Optional[date] = None):
+        self._register_tenure(as_of)
+        with self.transaction():
+            self.connection.execute(
+                'UPDATE employees SET salary = py_round(salary * CASE WHEN months_of_service(hire_date) >= ? '
+                'THEN ? ELSE ? END)', (SENIOR_MONTHS, SENIOR_INDEX_RATE, INDEX_RATE))
+
+    def rest(self, as_of: Optional[date] = None) -> List[str]:
+        self._register_tenure(as_of)
+        return [name for name, in self.connection.execute(
+            'SELECT full_name FROM employees WHERE months_of_service(hire_date) >= ? ORDER BY id', (REST_MONTHS,))]
+
+    def wage_fund(self) -> int:
+        return self.connection.execute(f'SELECT COALESCE(SUM({ANNUAL_WAGE}), 0) FROM employees').fetchone()[0]
+
+    def totals_by_position(self) -> Dict[str, Totals]:
+        totals = {}
+        for position, count, salary, premium_kopecks, wage_fund in self.connection.execute(
+                f'SELECT position, COUNT(*), SUM(salary), SUM(py_round(premium * 100)), SUM({ANNUAL_WAGE}) '
+                'FROM employees GROUP BY position ORDER BY position'):
+            total = totals[position] = Totals()
+            total.count, total.salary, total.premium_kopecks, total.wage_fund = (count, salary, premium_kopecks,
+                                                                                 wage_fund)
+        return totals
+
+    def store_taxes(self, batch_size: int = BATCH_SIZE) -> int:
+        # Расчёт зависит только от (оклад, пол, программист): считаются лишь сочетания, которых ещё нет в базе
+        missing = self.connection.execute(
+            'SELECT DISTINCT salary, sex, programmer FROM employees e WHERE NOT EXISTS ('
+            'SELECT 1 FROM tax_schedules t WHERE t.salary = e.salary AND t.sex = e.sex '
+            'AND t.programmer = e.programmer)').fetchall()
+        if not missing:
+            return 0
+        salary, sex, programmer = zip(*missing)
+        taxes = compute_taxes(numpy.array(salary), numpy.array(sex, dtype=str), numpy.array(programmer, dtype=bool))
+        records = ((key[0], key[1], key[2], schedule[13], json.dumps(schedule, ensure_ascii=False))
+                   for key, schedule in zip(missing, (taxes.to_dict(i) for i in range(len(taxes)))))
+        return self._executemany('INSERT INTO tax_schedules (salary, sex, programmer, total, schedule) '
+                                 'VALUES (?, ?, ?, ?, ?)', records, batch_size)
+
+    def taxes(self, full_name: str) -> Optional[dict]:
+        self.store_taxes()
+        row = self.connection.execute(
+            'SELECT t.schedule FROM employees e JOIN tax_schedules t USING (salary, sex, programmer) '
+            'WHERE e.full_name = ? ORDER BY e.id LIMIT 1', (full_name,)).fetchone()
+        return _parse_schedule(row[0]) if row else None
+
+    def iter_taxes(self, batch_size: int = BATCH_SIZE) -> Iterator[Tuple[str, dict]]:
+        self.store_taxes()
+        cursor = self.connection.execute(
+            'SELECT e.full_name, t.schedule FROM employees e JOIN tax_schedules t USING (salary, sex, programmer) '
+            'ORDER BY e.id')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for full_name, schedule in rows:
+                yield full_name, _parse_schedule(schedule)
+
+    def taxes_total(self) -> float:
+        self.store_taxes()
+        return self.connection.execute(
+            'SELECT COALESCE(SUM(t.total), 0) FROM employees e '
+            'JOIN tax_schedules t USING (salary, sex, programmer)').fetchone()[0]
+
+
+def open_store(path: str) -> EmployeeStore:
+    return EmployeeStore(path)
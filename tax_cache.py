@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from typing import Callable, Optional
+import atexit, json, os
+
+MAXSIZE = 4096
+# Путь к файлу, в котором кэш по умолчанию сохраняется между запусками
+CACHE_ENV = 'PAYROLL_TAX_CACHE'
+
+
+def _copy(schedule: dict) -> dict:
+    # Копия, чтобы изменения у вызывающего не попадали в кэш
+    result = {month: {**details, 'taxes': dict(details['taxes'])} for month, details in schedule.items() if month != 13}
+    result[13] = schedule[13]
+    return result
+
+
+def schedule_from_json(schedule: dict) -> dict:
+    # json превращает номера месяцев в строки - возвращаем целые, как у taxes_counter
+    return {int(month): value for month, value in schedule.items()}
+
+
+class TaxCache:
+    def __init__(self, maxsize: Optional[int] = MAXSIZE, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._schedules = OrderedDict()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._schedules)
+
+    def get(self, salary: int, sex: str, programmer: bool, compute: Callable[[int, str, bool], dict]) -> dict:
+        key = (salary, sex, bool(programmer))
+        schedule = self._schedules.get(key)
+        if schedule is None:
+            self.misses += 1
+            schedule = compute(*key)
+            self._schedules[key] = schedule
+            if self.maxsize is not None and len(self._schedules) > self.maxsize:
+                self._schedules.popitem(last=False)
+        else:
+            self.hits += 1
+            self._schedules.move_to_end(key)
+        return _copy(schedule)
+
+    def clear(self):
+        self._schedules.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._schedules),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / requests if requests else 0.0,
+        }
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        entries = [[salary, sex, programmer, schedule]
+                   for (salary, sex, programmer), schedule in self._schedules.items()]
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(entries, file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    def load(self, path: Optional[str] = None):
+        with open(path or self.path, encoding='utf-8') as file:
+            entries = json.load(file)
+        for salary, sex, programmer, schedule in entries:
+            self._schedules[(salary, sex, programmer)] = schedule_from_json(schedule)
+            if self.maxsize is not None and len(self._schedules) > self.maxsize:
+                self._schedules.popitem(last=False)
+
+
+_default: Optional[TaxCache] = None
+
+
+def default() -> TaxCache:
+    global _default
+    if _default is None:
+        path = os.environ.get(CACHE_ENV)
+        _default = TaxCache(path=path)
+        if path:
+            atexit.register(_default.save)
+    return _default
+
+
+def default_stats() -> Optional[dict]:
+    # None, если кэшем по умолчанию в этом процессе ещё не пользовались
+    return _default.stats() if _default is not None else None
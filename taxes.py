@@ -0,0 +1,133 @@
+from typing import Dict, Iterator, List, Tuple
+import numpy
+
+NDFL_THRESHOLD = 5000000
+NDFL_LOW_RATE = 0.13
+NDFL_HIGH_RATE = 0.15
+FSS_RATE = 0.3
+HOLIDAY_PREMIUM = 2000
+PROGRAMMER_PREMIUM_RATE = 0.03
+
+
+# Насколько x * 100 может отойти от точного значения: несколько единиц последнего разряда, но не меньше 1e-6
+HALF_TOLERANCE = 1e-6
+HALF_TOLERANCE_ULPS = 8
+
+
+def round2(values: numpy.ndarray) -> numpy.ndarray:
+    # numpy.round(x, 2) считает через x * 100, что изредка расходится со встроенным round
+    # на значениях, близких к половине копейки - такие значения досчитываем через round
+    result = numpy.round(values, 2)
+    scaled = numpy.abs(values * 100)
+    tolerance = numpy.maximum(HALF_TOLERANCE, HALF_TOLERANCE_ULPS * numpy.spacing(scaled))
+    near_half = numpy.abs(scaled % 1 - 0.5) < tolerance
+    if near_half.any():
+        result[near_half] = [round(value, 2) for value in values[near_half].tolist()]
+    return result
+
+
+class TaxTable:
+    def __init__(self, salary: numpy.ndarray, premium: numpy.ndarray, ndfl: numpy.ndarray,
+                 fss: numpy.ndarray, month_sum: numpy.ndarray, total: numpy.ndarray,
+                 programmer: numpy.ndarray):
+        self.salary = salary
+        self.premium = premium
+        self.ndfl = ndfl
+        self.fss = fss
+        self.month_sum = month_sum
+        self.total = total
+        self.programmer = programmer
+
+    def __len__(self) -> int:
+        return len(self.salary)
+
+    def to_dict(self, i: int) -> dict:
+        # Та же структура и те же типы значений, что и у Employee.taxes_counter
+        salary = int(self.salary[i])
+        premium = self.premium[i].tolist()
+        ndfl = self.ndfl[i].tolist()
+        fss = self.fss[i].tolist()
+        month_sum = self.month_sum[i].tolist()
+        programmer = bool(self.programmer[i])
+        result = {}
+        for month in range(12):
+            month_prem = premium[month]
+            result[month + 1] = {
+                'salary': salary,
+                'premium': month_prem if programmer and month == 8 else int(month_prem),
+                'taxes': {
+                    'НДФЛ': ndfl[month],
+                    'ФСС': fss[month]
+                },
+                'month_sum': month_sum[month]
+            }
+        result[13] = float(self.total[i])
+        return result
+
+    def to_dicts(self, names: List[str]) -> Dict[str, dict]:
+        return dict(self.items(names))
+
+    def items(self, names: List[str]) -> Iterator[Tuple[str, dict]]:
+        for i, name in enumerate(names):
+            yield name, self.to_dict(i)
+
+    def unique_items(self, names: List[str]) -> Iterator[Tuple[str, dict]]:
+        # Как у словаря {ФИО: отчисления}: у однофамильцев остаётся последний, на месте первого
+        last = {name: i for i, name in enumerate(names)}
+        for name, i in last.items():
+            yield name, self.to_dict(i)
+
+
+def tax_input_keys(salary: numpy.ndarray, sex: numpy.ndarray, programmer: numpy.ndarray) -> numpy.ndarray:
+    # Одно целое на сочетание (оклад, пол, программист): от них и только от них зависит расчёт.
+    # Пол - М, Ж или любой другой; массивы приводятся по правилам broadcasting
+    sex_code = numpy.where(sex == 'М', 0, numpy.where(sex == 'Ж', 1, 2))
+    return salary * 6 + sex_code * 2 + programmer
+
+
+def compute_taxes(salary: numpy.ndarray, sex: numpy.ndarray, programmer: numpy.ndarray,
+                  unique_inputs: bool = True) -> TaxTable:
+    salary = numpy.asarray(salary, dtype=numpy.int64)
+    sex = numpy.asarray(sex)
+    programmer = numpy.asarray(programmer, dtype=bool)
+    if unique_inputs and len(salary):
+        # Расчёт зависит только от (оклад, пол, программист): считаем каждое сочетание один раз
+        keys = tax_input_keys(salary, sex, programmer)
+        _, first, inverse = numpy.unique(keys, return_index=True, return_inverse=True)
+        if len(first) < len(salary):
+            unique = _compute(salary[first], sex[first], programmer[first])
+            return TaxTable(salary, unique.premium[inverse], unique.ndfl[inverse], unique.fss[inverse],
+                            unique.month_sum[inverse], unique.total[inverse], programmer)
+    return _compute(salary, sex, programmer)
+
+
+def _compute(salary: numpy.ndarray, sex: numpy.ndarray, programmer: numpy.ndarray) -> TaxTable:
+    size = len(salary)
+    salary_f = salary.astype(numpy.float64)
+
+    premium = numpy.zeros((size, 12))
+    premium[:, 1] = numpy.where(sex == 'М', HOLIDAY_PREMIUM, 0)
+    premium[:, 2] = numpy.where(sex == 'Ж', HOLIDAY_PREMIUM, 0)
+    premium[:, 8] = numpy.where(programmer, salary_f * PROGRAMMER_PREMIUM_RATE, 0)
+
+    ndfl = numpy.empty((size, 12))
+    fss = numpy.empty((size, 12))
+    month_sum = numpy.empty((size, 12))
+    total = numpy.zeros(size)
+    accumulated = numpy.zeros(size)
+    for month in range(12):
+        month_prem = premium[:, month]
+        income = salary_f + month_prem
+        below = accumulated + salary_f + month_prem <= NDFL_THRESHOLD
+        crossing = ~below & (accumulated <= NDFL_THRESHOLD)
+        rest = NDFL_THRESHOLD - accumulated
+        raw_tax = numpy.where(
+            below, income * NDFL_LOW_RATE,
+            numpy.where(crossing, rest * NDFL_LOW_RATE + (income - rest) * NDFL_HIGH_RATE,
+                        salary_f * NDFL_HIGH_RATE))
+        ndfl[:, month] = round2(raw_tax)
+        accumulated += income
+        fss[:, month] = round2(income * FSS_RATE)
+        month_sum[:, month] = salary_f + fss[:, month]
+        total += month_sum[:, month]
+    return TaxTable(salary, premium, ndfl, fss, month_sum, total, programmer)
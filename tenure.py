@@ -0,0 +1,85 @@
+from calendar import monthrange
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Iterable, Optional
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    import numpy
+
+SENIOR_MONTHS = 120
+SENIOR_INDEX_RATE = 1.07
+INDEX_RATE = 1.05
+REST_MONTHS = 6
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def months_between(hire_date: date, as_of: date) -> int:
+    # Полные месяцы стажа, как relativedelta(as_of, hire_date) в пересчёте на месяцы.
+    # День найма "прижимается" к концу месяца, как при сложении с relativedelta(months=...)
+    months = (as_of.year - hire_date.year) * 12 + as_of.month - hire_date.month
+    anchor = min(hire_date.day, monthrange(as_of.year, as_of.month)[1])
+    if months > 0 and as_of.day < anchor:
+        months -= 1
+    elif months < 0 and as_of.day > anchor:
+        months += 1
+    return months
+
+
+def months_of_service(hire_dates: 'numpy.ndarray', as_of: Optional[date] = None) -> 'numpy.ndarray':
+    import numpy
+    as_of = _as_date(as_of or date.today())
+    as_of_month = numpy.datetime64(as_of, 'M')
+    hire_dates = numpy.asarray(hire_dates, dtype='datetime64[D]')
+    hire_month = hire_dates.astype('datetime64[M]')
+    hire_day = (hire_dates - hire_month.astype('datetime64[D]')).astype(numpy.int64) + 1
+    months = (as_of_month - hire_month).astype(numpy.int64)
+    anchor = numpy.minimum(hire_day, monthrange(as_of.year, as_of.month)[1])
+    months -= (months > 0) & (as_of.day < anchor)
+    months += (months < 0) & (as_of.day > anchor)
+    return months
+
+
+class Tenure:
+    def __init__(self, as_of: Optional[date] = None):
+        self.as_of = _as_date(as_of or date.today())
+        self._cache = WeakKeyDictionary()
+
+    def months(self, employee) -> int:
+        hire_date = employee.hire_date
+        cached = self._cache.get(employee)
+        # Кэш сбрасывается сам, если дату найма поменяли
+        if cached is None or cached[0] != hire_date:
+            cached = (hire_date, months_between(_as_date(hire_date), self.as_of))
+            self._cache[employee] = cached
+        return cached[1]
+
+    def precompute(self, employees: Iterable):
+        # Стаж всего списка одним расчётом по массиву дат: дальше index() и rest() берут его из кэша
+        import numpy
+        employees = list(employees)
+        hire_dates = [employee.hire_date for employee in employees]
+        # numpy.array из объектов date заметно медленнее, чем из порядковых номеров дней
+        days = numpy.array([value.toordinal() for value in hire_dates], dtype=numpy.int64) - EPOCH_ORDINAL
+        months = months_of_service(days.astype('datetime64[D]'), self.as_of)
+        for employee, hire_date, value in zip(employees, hire_dates, months.tolist()):
+            self._cache[employee] = (hire_date, value)
+
+    def index_rate(self, employee) -> float:
+        return SENIOR_INDEX_RATE if self.months(employee) >= SENIOR_MONTHS else INDEX_RATE
+
+    def rest(self, employee) -> bool:
+        return self.months(employee) >= REST_MONTHS
+
+
+_current: Optional[Tenure] = None
+
+
+def current() -> Tenure:
+    global _current
+    if _current is None or _current.as_of != date.today():
+        _current = Tenure()
+    return _current
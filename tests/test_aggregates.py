@@ -0,0 +1,51 @@
+from datetime import date, datetime
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Employee import Employee
+from aggregates import PayrollAggregate
+import tenure
+
+
+def make_employees():
+    return [
+        Employee('Иванов', 'Иван', 'Старший программист', datetime(2010, 3, 15), 250000, 'М', 'Иванович'),
+        Employee('Петрова', 'Анна', 'Аналитик', datetime(2020, 7, 1), 120000, 'Ж'),
+        Employee('Сидоров', 'Пётр', 'Менеджер', datetime(2015, 1, 31), 4500050, 'М', 'Сергеевич'),
+        Employee('Корнеева', 'Мария', 'Младший программист', datetime(2023, 11, 20), 60150, 'Ж', 'Игоревна'),
+    ]
+
+
+def test_totals_match_rescan_after_changes():
+    employees = make_employees()
+    aggregate = PayrollAggregate(employees)
+    assert aggregate.verify()
+
+    service = tenure.Tenure(date(2024, 6, 1))
+    for employee in employees:
+        employee.index(service)
+    assert aggregate.verify()
+
+    for employee in employees:
+        employee.prem_prog()
+        employee.prem_man()
+        employee.prem_wom()
+    assert aggregate.verify()
+
+    employees[1].salary = 130000
+    employees[1].position = 'Ведущий программист'
+    employees[2].sex = 'ж'
+    employees[3].position = 'Тестировщик'
+    assert aggregate.verify()
+    assert aggregate.wage_fund == Employee.wage_fund(employees)
+    assert set(aggregate.by_position) == {employee.position for employee in employees}
+
+
+def test_removed_employee_no_longer_counted():
+    employees = make_employees()
+    aggregate = PayrollAggregate(employees)
+    aggregate.remove(employees[0])
+    employees[0].salary = 1
+    assert aggregate.verify()
+    assert aggregate.wage_fund == Employee.wage_fund(employees[1:])
@@ -0,0 +1,31 @@
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loader import ParseReport
+from storage import EmployeeStore
+
+CSV = '''ФИО;Должность;Дата найма;Оклад;Пол;Размер премии
+Иванов Иван Иванович;Менеджер;22.10.2013;250000;М;0
+Иванов Иван Иванович;Менеджер;22.10.2013;100000;М;0
+Сорокина Екатерина Матвеевна;Аналитик;12.03.2020;75000;Ж;0
+x;y
+'''
+
+
+def test_import_reports_merged_rows(tmp_path):
+    path = tmp_path / 'employees.csv'
+    path.write_text(CSV, encoding='utf-8')
+    report = ParseReport()
+    with EmployeeStore() as store:
+        with store.transaction():
+            count = store.import_csv(str(path), report)
+        assert count == len(store) == 2
+        assert report.rows_ok == 2
+        assert [error.line for error in report.errors] == [5, 3]
+        assert 'строке 2' in report.errors[1].message
+        # Повторный импорт обновляет те же записи и ничего не сообщает о прошлом импорте
+        again = ParseReport()
+        assert store.import_csv(str(path), again) == 2
+        assert len(store) == 2
+        assert [error.line for error in again.errors] == [5, 3]
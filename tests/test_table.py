@@ -0,0 +1,71 @@
+from datetime import date, datetime
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Employee import Employee
+from EmployeeTable import EmployeeTable
+import pytest, tenure
+
+# Конец февраля: у найма 29-31 числа стаж "прижимается" к последнему дню месяца
+AS_OF_DATES = [date(2024, 2, 29), date(2023, 2, 28), date(2024, 3, 31), date(2024, 6, 1)]
+
+
+def make_employees():
+    hire_dates = [
+        datetime(2014, 2, 28), datetime(2015, 8, 29), datetime(2014, 1, 29), datetime(2014, 1, 30),
+        datetime(2014, 1, 31), datetime(2013, 3, 31), datetime(2013, 2, 28), datetime(2012, 2, 29),
+        datetime(2023, 8, 29), datetime(2023, 8, 30), datetime(2023, 8, 31), datetime(2023, 9, 1),
+        datetime(2022, 8, 31), datetime(2024, 1, 31), datetime(2024, 5, 31), datetime(2004, 12, 31),
+    ]
+    positions = ['Старший программист', 'Аналитик', 'Менеджер', 'Младший программист']
+    salaries = [250000, 120000, 4500050, 60150, 33333, 99999, 45, 1000001]
+    sexes = ['М', 'Ж', 'Мужской', 'ж']
+    return [Employee(f'Фамилия{i}', f'Имя{i}', positions[i % len(positions)], hire_date,
+                     salaries[i % len(salaries)], sexes[i % len(sexes)], f'Отчество{i}' if i % 3 else None)
+            for i, hire_date in enumerate(hire_dates)]
+
+
+def dicts(employees):
+    return [repr(employee.to_dict()) for employee in employees]
+
+
+def test_from_employees_round_trip():
+    employees = make_employees()
+    assert dicts(EmployeeTable.from_employees(employees)) == dicts(employees)
+
+
+@pytest.mark.parametrize('method', ['prem_prog', 'prem_man', 'prem_wom'])
+def test_premiums_match_employee(method):
+    employees = make_employees()
+    table = EmployeeTable.from_employees(employees)
+    for _ in range(2):
+        getattr(table, method)()
+        for employee in employees:
+            getattr(employee, method)()
+    assert dicts(table) == dicts(employees)
+
+
+@pytest.mark.parametrize('as_of', AS_OF_DATES)
+def test_index_and_rest_match_employee(as_of):
+    employees = make_employees()
+    table = EmployeeTable.from_employees(employees)
+    service = tenure.Tenure(as_of)
+    assert table.rest(as_of).tolist() == [employee.rest(service) for employee in employees]
+    table.index(as_of)
+    for employee in employees:
+        employee.index(service)
+    assert dicts(table) == dicts(employees)
+
+
+@pytest.mark.parametrize('as_of', AS_OF_DATES)
+def test_wage_fund_matches_employee(as_of):
+    employees = make_employees()
+    table = EmployeeTable.from_employees(employees)
+    service = tenure.Tenure(as_of)
+    table.prem_prog()
+    table.index(as_of)
+    for employee in employees:
+        employee.prem_prog()
+        employee.index(service)
+    assert table.wage_fund() == Employee.wage_fund(employees)
@@ -0,0 +1,52 @@
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Employee import Employee
+from taxes import NDFL_THRESHOLD, compute_taxes, round2
+import numpy, pytest
+
+SEXES = ['М', 'Ж', 'Мужской']
+# Порог НДФЛ пересекается в разные месяцы: в феврале, сентябре (вместе с премией программиста),
+# в декабре и сразу в январе
+THRESHOLD_SALARIES = [416666, 416667, 416700, 555555, 555556, 4500050, NDFL_THRESHOLD, NDFL_THRESHOLD + 1,
+                      NDFL_THRESHOLD // 12, NDFL_THRESHOLD // 9, 2500000, 6000000]
+SMALL_SALARIES = [0, 1, 45, 60150, 75000, 99999, 120000, 250000, 33333, 12345]
+
+
+def check(salary, sex, programmer):
+    taxes = compute_taxes(salary, sex, programmer)
+    for i in range(len(taxes)):
+        expected = Employee.taxes_schedule(int(salary[i]), str(sex[i]), bool(programmer[i]))
+        assert repr(taxes.to_dict(i)) == repr(expected), (salary[i], sex[i], programmer[i])
+
+
+@pytest.mark.parametrize('programmer', [False, True])
+@pytest.mark.parametrize('sex', SEXES)
+def test_fixed_salaries_match_schedule(sex, programmer):
+    salary = numpy.array(THRESHOLD_SALARIES + SMALL_SALARIES)
+    check(salary, numpy.array([sex] * len(salary)), numpy.array([programmer] * len(salary)))
+
+
+def test_random_salaries_match_schedule():
+    generator = numpy.random.default_rng(2024)
+    size = 5000
+    salary = numpy.concatenate([generator.integers(1, 1000000, size // 2),
+                                generator.integers(300000, 7000000, size - size // 2)])
+    sex = numpy.array(SEXES)[generator.integers(0, len(SEXES), size)]
+    check(salary, sex, generator.random(size) < 0.5)
+
+
+def test_repeated_inputs_match_unique_computation():
+    salary = numpy.array([416667, 75000, 416667, 75000, 4500050])
+    sex = numpy.array(['М', 'Ж', 'М', 'Ж', 'Ж'])
+    programmer = numpy.array([True, False, True, False, True])
+    shared = compute_taxes(salary, sex, programmer)
+    separate = compute_taxes(salary, sex, programmer, unique_inputs=False)
+    assert [repr(shared.to_dict(i)) for i in range(5)] == [repr(separate.to_dict(i)) for i in range(5)]
+
+
+def test_round2_matches_builtin_round():
+    values = numpy.array([0.125, 0.375, 2.675, 1.005, 1012.345, 22500.015, 649999.995, 1500000.005,
+                          37500.125, 150000.0049999, 0.0])
+    assert round2(values).tolist() == [round(value, 2) for value in values.tolist()]
@@ -0,0 +1,22 @@
+from datetime import date, datetime
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Employee import Employee
+import pytest, tenure
+
+HIRE_DATES = [datetime(2014, 1, 31), datetime(2014, 2, 28), datetime(2012, 2, 29), datetime(2013, 3, 31),
+              datetime(2023, 8, 29), datetime(2023, 8, 31), datetime(2024, 2, 29), datetime(2025, 1, 15)]
+
+
+@pytest.mark.parametrize('as_of', [date(2024, 2, 29), date(2023, 2, 28), date(2024, 3, 30), date(2024, 12, 31)])
+def test_precompute_matches_scalar_months(as_of):
+    employees = [Employee('Фамилия', 'Имя', 'Аналитик', hire_date, 100000, 'Ж') for hire_date in HIRE_DATES]
+    service = tenure.Tenure(as_of)
+    service.precompute(employees)
+    assert [service.months(employee) for employee in employees] == [
+        tenure.months_between(hire_date.date(), as_of) for hire_date in HIRE_DATES]
+    # Смена даты найма сбрасывает предрассчитанное значение
+    employees[0].hire_date = '01.01.2000'
+    assert service.months(employees[0]) == tenure.months_between(date(2000, 1, 1), as_of)
@@ -25,4 +25,5 @@ TAXES_TEXT =\
 '''Желаете вывести значение для конкретного сотрудника или сохранить json файл для всех сотрудников?
 1. Вывести для конкретного сотрудника (перейти к выбору)
 2. Сохранить json файл с расчётом для всех сотрудников
+3. Сохранить текстовый отчёт для всех сотрудников
 9. Назад'''
\ No newline at end of file
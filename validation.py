@@ -0,0 +1,81 @@
+from datetime import date
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Sequence
+import re
+
+if TYPE_CHECKING:
+    import numpy
+
+NAME_PATTERN = re.compile(r'[А-Яа-яЁё]+')
+FILENAME_PATTERN = re.compile(r'^(?!.*\.\.)(?!.*\.$)(?!^\.)(?!.*\/)(?!.*\\)[\w\-.]+$')
+SEXES = ('М', 'Ж')
+LOW_HIRE_DATE = date(2000, 1, 1)
+
+LAST_NAME_LENGTH_MSG = 'Фамилия не может состоять из такого количества букв'
+LAST_NAME_CYRILLIC_MSG = 'Фамилия должна быть написана кириллицей'
+FIRST_NAME_LENGTH_MSG = 'Имя не может состоять из такого количества букв'
+FIRST_NAME_CYRILLIC_MSG = 'Имя должно быть написано кириллицей'
+MIDDLE_NAME_LENGTH_MSG = 'Отчество не может состоять из такого количества букв'
+MIDDLE_NAME_CYRILLIC_MSG = 'Отчество должно быть написано кириллицей'
+POSITION_MSG = 'Название должности не может состоять из такого количества букв'
+HIRE_DATE_MSG = 'Введена неверная дата'
+SALARY_MSG = 'Зарплата не может быть отрицательной'
+SEX_MSG = 'Пол должен быть указан в формате М/Ж'
+
+
+class ValidationError(NamedTuple):
+    row: int
+    field: str
+    message: str
+
+
+def _names_errors(values: Sequence[Optional[str]], min_length: int, optional: bool = False) -> tuple:
+    import numpy
+    too_short = numpy.fromiter((not (optional and not value) and len(value) < min_length for value in values),
+                               dtype=bool, count=len(values))
+    fullmatch = NAME_PATTERN.fullmatch
+    not_cyrillic = numpy.fromiter((bool(value) and fullmatch(value) is None for value in values),
+                                  dtype=bool, count=len(values))
+    return too_short, not_cyrillic & ~too_short
+
+
+def validate_columns(last_names: Sequence[str], first_names: Sequence[str], middle_names: Sequence[Optional[str]],
+                     positions: Sequence[str], hire_dates: 'numpy.ndarray', salary: 'numpy.ndarray',
+                     sex: 'numpy.ndarray', as_of: Optional[date] = None) -> List[ValidationError]:
+    import numpy
+    # Проверка целыми столбцами: те же правила, что и в сеттерах Employee
+    as_of = as_of or date.today()
+    hire_dates = numpy.asarray(hire_dates, dtype='datetime64[D]')
+    checks = []
+    for field, values, min_length, optional, messages in (
+            ('last_name', last_names, 2, False, (LAST_NAME_LENGTH_MSG, LAST_NAME_CYRILLIC_MSG)),
+            ('first_name', first_names, 2, False, (FIRST_NAME_LENGTH_MSG, FIRST_NAME_CYRILLIC_MSG)),
+            ('middle_name', middle_names, 3, True, (MIDDLE_NAME_LENGTH_MSG, MIDDLE_NAME_CYRILLIC_MSG))):
+        for mask, message in zip(_names_errors(values, min_length, optional), messages):
+            checks.append((field, mask, message))
+    checks.append(('position', numpy.fromiter((len(value) < 2 for value in positions), dtype=bool,
+                                              count=len(positions)), POSITION_MSG))
+    checks.append(('hire_date', (hire_dates < numpy.datetime64(LOW_HIRE_DATE, 'D'))
+                   | (hire_dates > numpy.datetime64(as_of, 'D')), HIRE_DATE_MSG))
+    checks.append(('salary', numpy.asarray(salary) < 0, SALARY_MSG))
+    checks.append(('sex', ~numpy.isin(numpy.asarray(sex), SEXES), SEX_MSG))
+
+    errors = []
+    for field, mask, message in checks:
+        errors.extend(ValidationError(int(row), field, message) for row in numpy.flatnonzero(mask))
+    errors.sort(key=lambda error: error.row)
+    return errors
+
+
+def validate_rows(rows: Sequence[tuple], as_of: Optional[date] = None) -> List[ValidationError]:
+    # Строки в виде loader.parse_row - до сборки EmployeeTable, где пол уже обрезан до одной буквы
+    import numpy
+    last_names, first_names, middle_names, positions, hire_dates, salary, sex = zip(*rows) if rows else ([],) * 7
+    return validate_columns(last_names, first_names, middle_names, positions,
+                            numpy.array([value.date() for value in hire_dates], dtype='datetime64[D]'),
+                            numpy.array(salary, dtype=numpy.int64), numpy.array(sex, dtype=str), as_of)
+
+
+def validate_table(table, as_of: Optional[date] = None) -> List[ValidationError]:
+    positions = [table.positions[code] for code in table.position_code.tolist()]
+    return validate_columns(table.last_names, table.first_names, table.middle_names, positions,
+                            table.hire_date, table.salary, table.sex, as_of)
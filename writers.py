@@ -0,0 +1,129 @@
+from typing import Any, Iterable, List, Optional, TextIO
+import csv, json, shutil
+
+PRETTY = 'pretty'
+COMPACT = 'compact'
+JSON_LINES = 'jsonl'
+MODES = (PRETTY, COMPACT, JSON_LINES)
+
+BUFFER_SIZE = 1 << 20
+CSV_BATCH_SIZE = 10000
+
+
+def _dumps(value: Any, mode: str) -> str:
+    if mode == PRETTY:
+        return json.dumps(value, ensure_ascii=False, indent=4)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def object_entry(key: str, value: Any, mode: str = PRETTY) -> str:
+    # Пара объекта без отступов и разделителей: их добавляет writer в зависимости от места в документе
+    if mode == JSON_LINES:
+        return _dumps({key: value}, mode)
+    separator = ': ' if mode == PRETTY else ':'
+    return json.dumps(key, ensure_ascii=False) + separator + _dumps(value, mode)
+
+
+class _JsonStreamWriter:
+    # Пишет документ по одному элементу, не собирая его целиком в памяти.
+    # В режиме pretty результат байт в байт совпадает с json.dump(..., indent=4)
+    OPEN = CLOSE = ''
+
+    def __init__(self, file: TextIO, mode: str = PRETTY):
+        if mode not in MODES:
+            raise ValueError(f'Неизвестный режим записи: {mode}')
+        self.file = file
+        self.mode = mode
+        self.count = 0
+
+    def __enter__(self):
+        if self.mode != JSON_LINES:
+            self.file.write(self.OPEN)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self.mode == JSON_LINES:
+            return
+        if self.mode == PRETTY and self.count:
+            self.file.write('\n')
+        self.file.write(self.CLOSE)
+
+    def append_fragment(self, path: str, count: int):
+        # Дописывает элементы, записанные другим writer'ом без open/close (см. parallel.py)
+        if not count:
+            return
+        if self.count and self.mode != JSON_LINES:
+            self.file.write(',')
+        with open(path, encoding='utf-8') as part:
+            shutil.copyfileobj(part, self.file, BUFFER_SIZE)
+        self.count += count
+
+    def _write_entry(self, text: str):
+        if self.mode == JSON_LINES:
+            self.file.write(text + '\n')
+        elif self.mode == PRETTY:
+            self.file.write((',\n    ' if self.count else '\n    ') + text.replace('\n', '\n    '))
+        else:
+            self.file.write(',' + text if self.count else text)
+        self.count += 1
+
+
+class JsonArrayWriter(_JsonStreamWriter):
+    OPEN, CLOSE = '[', ']'
+
+    def write(self, item: Any):
+        self._write_entry(_dumps(item, self.mode))
+
+    def write_many(self, items: Iterable[Any]):
+        for item in items:
+            self.write(item)
+
+
+class JsonObjectWriter(_JsonStreamWriter):
+    OPEN, CLOSE = '{', '}'
+
+    def write(self, key: str, value: Any):
+        self._write_entry(object_entry(key, value, self.mode))
+
+    def write_entry(self, text: str):
+        # Пара, заранее подготовленная object_entry() с тем же режимом
+        self._write_entry(text)
+
+
+def open_output(filename: str) -> TextIO:
+    return open(filename, mode='w', encoding='utf-8', buffering=BUFFER_SIZE)
+
+
+def write_json_array(items: Iterable[Any], filename: str, mode: str = PRETTY) -> int:
+    with open_output(filename) as file, JsonArrayWriter(file, mode) as writer:
+        writer.write_many(items)
+    return writer.count
+
+
+def write_json_object(pairs: Iterable[tuple], filename: str, mode: str = PRETTY) -> int:
+    with open_output(filename) as file, JsonObjectWriter(file, mode) as writer:
+        for key, value in pairs:
+            writer.write(key, value)
+    return writer.count
+
+
+def write_csv_rows(rows: Iterable[List[Any]], filename: str, fieldnames: Optional[List[str]] = None,
+                   batch_size: int = CSV_BATCH_SIZE) -> int:
+    count = 0
+    with open(filename, mode='w', newline='', encoding='utf-8', buffering=BUFFER_SIZE) as file:
+        writer = csv.writer(file, delimiter=';')
+        if fieldnames:
+            writer.writerow(fieldnames)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.writerows(batch)
+                count += len(batch)
+                batch = []
+        writer.writerows(batch)
+        count += len(batch)
+    return count